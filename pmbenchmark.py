@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import sys
+import shutil
+import tempfile
+import pmlib
+
+from optparse import OptionParser
+
+from pmlib.benchmark import Benchmark
+from pmlib.benchmark.generator import Scale
+
+
+if __name__ == '__main__':
+
+    parser = OptionParser(usage="usage: %prog [options]")
+    parser.add_option("-v", "--verbose", help="run verbose level [0..3]", type="int", metavar="0", default=0)
+    parser.add_option("-d", "--data", help="folder for generated data, temporary if empty", type="string",
+                      metavar="<FOLDER>", default="")
+    parser.add_option("-o", "--output", help="file for the JSON results", type="string", metavar="<FILE>",
+                      default="benchmark.json")
+    parser.add_option("--trays", help="number of trays", type="int", metavar="4", default=4)
+    parser.add_option("--folders", help="number of folders", type="int", metavar="20", default=20)
+    parser.add_option("--messages", help="number of mails per folder", type="int", metavar="100", default=100)
+    parser.add_option("--size", help="minimum size of a mail in bytes", type="int", metavar="2048", default=2048)
+    parser.add_option("--headers", help="number of additional headers per mail", type="int", metavar="4",
+                      default=4)
+    parser.add_option("--rules", help="number of filter rules", type="int", metavar="50", default=50)
+    parser.add_option("--unix", help="share of unix (MBX) folders", type="float", metavar="0.5", default=0.5)
+    parser.add_option("--jobs", help="number of parallel jobs for the jobs stage", type="int", metavar="4",
+                      default=4)
+    parser.add_option("--seed", help="seed for the generated data", type="int", metavar="0", default=0)
+
+    (options, args) = parser.parse_args()
+
+    pmlib.log.setup(app="pmbenchmark", level=options.verbose)
+
+    console = pmlib.log.get_writer("console")
+    console.setup(text_space=15, error_index=["ERROR", "EXCEPTION"])
+    pmlib.log.register(console)
+    pmlib.log.open()
+
+    path = options.data
+    if path == "":
+        path = tempfile.mkdtemp(prefix="pmbenchmark")
+
+    scale = Scale(trays=options.trays,
+                  folders=options.folders,
+                  messages=options.messages,
+                  size=options.size,
+                  headers=options.headers,
+                  rules=options.rules,
+                  unix=options.unix,
+                  seed=options.seed)
+
+    benchmark = Benchmark(os.path.abspath(path), scale, options.jobs)
+
+    result = benchmark.generate()
+
+    if result is True:
+        result = benchmark.run()
+
+    if result is True:
+        result = benchmark.write(os.path.abspath(options.output))
+
+    if options.data == "":
+        shutil.rmtree(path, ignore_errors=True)
+
+    if result is False:
+        sys.exit(1)
+
+    sys.exit(0)
@@ -44,10 +44,21 @@ if __name__ == '__main__':
     if main.prepare() is False:
         sys.exit(1)
 
-    if main.run() is False:
+    result = False
+
+    try:
+        result = main.run()
+
+        if result is True:
+            result = main.close()
+    finally:
+        if main.write_metrics(result) is False:
+            result = False
+
+    if result is False:
         sys.exit(1)
 
-    if main.close() is False:
+    if main.watch() is False:
         sys.exit(1)
 
     sys.exit(0)
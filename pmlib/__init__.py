@@ -17,17 +17,23 @@
 #
 
 __all__ = [
+    "benchmark",
     "convert",
     "filter",
     "report",
 
     "conf",
     "console",
+    "dedup",
     "glob",
     "hierachy",
+    "index",
     "item",
+    "manifest",
+    "metrics",
     "types",
     "utils",
+    "watch",
 
     "config",
     "data",
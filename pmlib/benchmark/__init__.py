@@ -0,0 +1,364 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+__all__ = [
+    "generator",
+
+    "Stage",
+    "Benchmark"
+]
+
+import os
+import json
+import mailbox
+import time
+import platform
+
+from array import array
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Callable, Any
+
+import pmlib
+
+from pmlib.benchmark.generator import Scale, Generator
+from pmlib.glob import Data
+from pmlib.hierachy import Hierarchy
+from pmlib.item import Item
+from pmlib.report.excel import ReportExcel
+from pmlib.report.html import ReportHTML
+from pmlib.types import Entry, EntryReport, Source, Target
+from pmlib.utils import create_folder, find_separators
+
+
+@dataclass(init=True)
+class Stage(object):
+
+    name: str = ""
+    wall: float = 0.0
+    cpu: float = 0.0
+    count: int = 0
+    size: int = 0
+    result: bool = True
+
+    @property
+    def messages_per_second(self) -> float:
+        if self.wall == 0.0:
+            return 0.0
+        return self.count / self.wall
+
+    @property
+    def bytes_per_second(self) -> float:
+        if self.wall == 0.0:
+            return 0.0
+        return self.size / self.wall
+
+
+def _scan_loop(stream: bytes) -> array:
+    # the per byte loop find_separators replaced, kept to compare against
+    ends = array("Q")
+    n = 0
+    for byte in stream:
+        if byte == 0x1a:
+            ends.append(n)
+        n += 1
+    return ends
+
+
+# reading modes the converter offers, each one has to write the same mails as the default
+_modes = [
+    ("mmap", {"use_mmap": True}),
+    ("block", {"block_size": 64}),
+    ("index", {"use_index": True})
+]
+
+
+class _Discard(object):
+
+    # used as router, so sources read and parse their mails without writing them
+
+    @staticmethod
+    def get_boxes(item: Item, box: Any, value) -> list:
+        return []
+
+
+class Benchmark(object):
+
+    def __init__(self, path: str, scale: Scale, jobs: int = 4):
+        self.path: str = path
+        self.scale: Scale = scale
+        self.jobs: int = jobs
+        self.stages: List[Stage] = []
+        self.count: int = 0
+        self.size: int = 0
+        self._scans: List[array] = []
+        return
+
+    def _measure(self, name: str, function: Callable, count: int = 0, size: int = 0) -> bool:
+        wall = time.perf_counter()
+        cpu = time.process_time()
+
+        result = function()
+
+        stage = Stage(name=name,
+                      wall=time.perf_counter() - wall,
+                      cpu=time.process_time() - cpu,
+                      count=count,
+                      size=size,
+                      result=result is not False)
+
+        self.stages.append(stage)
+        pmlib.log.inform("Benchmark", "{0:s}: {1:.3f}s".format(name, stage.wall))
+        return stage.result
+
+    def _folders(self, source: Source) -> List[Item]:
+        folders = []
+        for _item in pmlib.data.entries:
+            if (_item.type is Entry.folder) and (_item.valid is True) and (_item.data.type is source):
+                folders.append(_item)
+        return folders
+
+    def _read(self, source: Source) -> bool:
+        reader = pmlib.manager.get_source(source)
+
+        pmlib.manager.set_router(_Discard())
+
+        for _item in self._folders(source):
+            check = reader.read(_item, None)
+            if check is False:
+                pmlib.manager.set_router(None)
+                return False
+
+        pmlib.manager.set_router(None)
+        return True
+
+    def _scan(self, loop: bool) -> bool:
+        scans = []
+
+        for _item in self._folders(Source.pegasus):
+            f = open(_item.data.filename, mode="rb")
+            f.seek(128)
+            stream = f.read(-1)
+            f.close()
+
+            if loop is True:
+                scans.append(_scan_loop(stream))
+            else:
+                scans.append(find_separators(stream))
+
+        if len(self._scans) == 0:
+            self._scans = scans
+            return True
+
+        if scans != self._scans:
+            pmlib.log.error("Separator scans do not match!")
+            return False
+        return True
+
+    @staticmethod
+    def _configure(values: Dict[str, Any]) -> Dict[str, Any]:
+        previous = {}
+        for _name, _value in values.items():
+            previous[_name] = getattr(pmlib.config, _name)
+            setattr(pmlib.config, _name, _value)
+        return previous
+
+    @staticmethod
+    def _reset_reports():
+        for _item in pmlib.data.entries:
+            _item.report = EntryReport()
+        return
+
+    def _convert(self, target: Target, name: str) -> bool:
+        pmlib.config.target_path = os.path.join(self.path, name)
+        pmlib.config.target_type = target
+
+        check = create_folder(pmlib.config.target_path)
+        if check is False:
+            return False
+
+        self._reset_reports()
+
+        converter = pmlib.manager.get_target(target)
+
+        check = converter.prepare(pmlib.data.root)
+        if check is False:
+            return False
+
+        check = converter.run()
+        if check is False:
+            return False
+
+        check = converter.close()
+        return check
+
+    def _compare(self, first: str, second: str) -> bool:
+        first = os.path.join(self.path, first)
+        second = os.path.join(self.path, second)
+
+        for _path, _folders, _files in os.walk(first):
+            for _name in _files:
+                if _name.endswith(".mbx") is False:
+                    continue
+
+                filename = os.path.join(_path, _name)
+                other = os.path.join(second, os.path.relpath(filename, first))
+
+                # From_ lines are left out, they carry the time of the conversion. The index leaves out the
+                # empty line between MBX mails, which mailbox.mbox keeps for CRLF folders outside of Windows.
+                box = mailbox.mbox(filename)
+                values = [box.get_bytes(_key).rstrip(b"\r\n") for _key in box.iterkeys()]
+
+                box = mailbox.mbox(other)
+                others = [box.get_bytes(_key).rstrip(b"\r\n") for _key in box.iterkeys()]
+
+                if values != others:
+                    pmlib.log.error("Mails differ: {0:s}".format(os.path.relpath(filename, first)))
+                    return False
+        return True
+
+    @staticmethod
+    def _parse_filter() -> bool:
+        for _filename in ["WINRULEA.PMC", "WINRULES.PMC"]:
+            check = pmlib.data.filter.parse(_filename)
+            if check is False:
+                return False
+        return True
+
+    def generate(self) -> bool:
+        source = os.path.join(self.path, "source")
+
+        generator = Generator(source, self.scale)
+        check = self._measure("generate", generator.create)
+
+        self.count = generator.count
+        self.size = generator.size
+        self.stages[-1].count = generator.count
+        self.stages[-1].size = generator.size
+        return check
+
+    def run(self) -> bool:
+        pmlib.data = Data()
+        pmlib.config.pegasus_path = os.path.join(self.path, "source")
+        pmlib.config.pegasus_root = "My mailbox"
+
+        hierarchy = Hierarchy()
+
+        check = self._measure("hierarchy.parse", hierarchy.parse)
+        if check is False:
+            return False
+
+        self.stages[-1].count = len(pmlib.data.entries)
+        self._measure("hierarchy.sort", hierarchy.sort, len(pmlib.data.entries))
+
+        check = self._measure("filter.parse", self._parse_filter, self.scale.rules)
+        if check is False:
+            return False
+
+        folders = self._folders(Source.pegasus)
+        count = len(folders) * self.scale.messages
+        size = sum(os.path.getsize(_item.data.filename) for _item in folders)
+
+        for _name, _loop in [("scan.loop", True), ("scan.find", False)]:
+            check = self._measure(_name, lambda: self._scan(_loop), count, size)
+            if check is False:
+                return False
+
+        for _source, _name in [(Source.pegasus, "source.pmm"), (Source.unix, "source.mbx")]:
+            folders = self._folders(_source)
+            count = len(folders) * self.scale.messages
+            size = sum(os.path.getsize(_item.data.filename) for _item in folders)
+
+            check = self._measure(_name, lambda: self._read(_source), count, size)
+            if check is False:
+                return False
+
+            for _mode, _values in _modes:
+                # mmap and blocks only change how PMM folders are read, only MBX folders have an index
+                if (_source is Source.pegasus) and (_mode == "index"):
+                    continue
+
+                if (_source is Source.unix) and (_mode != "index"):
+                    continue
+
+                previous = self._configure(_values)
+                check = self._measure("{0:s}.{1:s}".format(_name, _mode), lambda: self._read(_source), count, size)
+                self._configure(previous)
+                if check is False:
+                    return False
+
+        for _target in [Target.mbox, Target.maildir]:
+            check = self._measure("target.{0:s}".format(_target.name), lambda: self._convert(_target, _target.name),
+                                  self.count, self.size)
+            if check is False:
+                return False
+
+        modes = _modes + [
+            ("passthrough", {"passthrough": True}),
+            ("jobs", {"jobs": self.jobs})
+        ]
+
+        for _mode, _values in modes:
+            name = "mbox.{0:s}".format(_mode)
+
+            previous = self._configure(_values)
+            check = self._measure("target.{0:s}".format(name), lambda: self._convert(Target.mbox, name),
+                                  self.count, self.size)
+            self._configure(previous)
+            if check is False:
+                return False
+
+            # generated bodies have no From_ lines, so every mode has to write the same mails
+            check = self._compare("mbox", name)
+            if check is False:
+                return False
+
+        for _report in [ReportHTML(), ReportExcel()]:
+            check = self._measure("report.{0:s}".format(_report.name.lower()), _report.create, len(pmlib.data.entries))
+            if check is False:
+                return False
+
+        return True
+
+    def write(self, filename: str) -> bool:
+        stages = []
+        for _stage in self.stages:
+            value = asdict(_stage)
+            value["messages_per_second"] = _stage.messages_per_second
+            value["bytes_per_second"] = _stage.bytes_per_second
+            stages.append(value)
+
+        data = {
+            "version": pmlib.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": asdict(self.scale),
+            "messages": self.count,
+            "size": self.size,
+            "stages": stages
+        }
+
+        try:
+            f = open(filename, mode="w", encoding="utf-8")
+            json.dump(data, f, indent=2)
+            f.close()
+        except OSError as e:
+            pmlib.log.exception(e)
+            return False
+
+        pmlib.log.inform("Benchmark", filename)
+        return True
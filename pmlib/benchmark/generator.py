@@ -0,0 +1,245 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import random
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from pmlib.index import pack_record
+
+__all__ = [
+    "Scale",
+    "Generator"
+]
+
+_words = [
+    "pegasus", "mail", "folder", "tray", "report", "invoice", "meeting", "update", "release", "server",
+    "backup", "network", "account", "project", "review", "support", "ticket", "order", "delivery", "status"
+]
+
+_domains = [
+    "example.com", "example.org", "example.net", "lists.example.com", "mail.example.de"
+]
+
+_headers = [
+    "Cc", "Reply-To", "Sender", "X-Mailer", "X-Priority", "Message-ID", "Received", "List-Id",
+    "MIME-Version", "Content-Type"
+]
+
+_start = datetime(2000, 1, 1)
+
+
+@dataclass(init=True)
+class Scale(object):
+
+    trays: int = 4
+    folders: int = 20
+    messages: int = 100
+    size: int = 2048
+    headers: int = 4
+    rules: int = 50
+    unix: float = 0.5
+    seed: int = 0
+
+
+class Generator(object):
+
+    def __init__(self, path: str, scale: Scale):
+        self.path: str = path
+        self.scale: Scale = scale
+        self.random: random.Random = random.Random(scale.seed)
+        self.folders: List[Tuple[str, str]] = []
+        self.count: int = 0
+        self.size: int = 0
+        return
+
+    def _address(self) -> str:
+        return "{0:s}{1:d}@{2:s}".format(self.random.choice(_words), self.random.randrange(100),
+                                         self.random.choice(_domains))
+
+    def _text(self, count: int) -> str:
+        return " ".join(self.random.choice(_words) for _ in range(count))
+
+    def _header(self, name: str) -> str:
+        if name in ["Cc", "Reply-To", "Sender"]:
+            return self._address()
+
+        if name == "Message-ID":
+            return "<{0:x}@{1:s}>".format(self.random.getrandbits(64), self.random.choice(_domains))
+
+        if name == "Received":
+            return "from {0:s} by {1:s}".format(self.random.choice(_domains), self.random.choice(_domains))
+
+        if name == "Content-Type":
+            return "text/plain; charset=ISO-8859-1"
+
+        if name == "MIME-Version":
+            return "1.0"
+        return self._text(2)
+
+    def message(self, date: datetime) -> bytes:
+        lines = [
+            "From: {0:s}".format(self._address()),
+            "To: {0:s}".format(self._address()),
+            "Subject: {0:s}".format(self._text(4)),
+            "Date: {0:s}".format(date.strftime("%a, %d %b %Y %H:%M:%S +0000"))
+        ]
+
+        for _name in self.random.sample(_headers, min(self.scale.headers, len(_headers))):
+            lines.append("{0:s}: {1:s}".format(_name, self._header(_name)))
+
+        lines.append("")
+
+        size = sum(len(_line) + 2 for _line in lines)
+        while size < self.scale.size:
+            # body lines never start with From, so the MBX folders stay unambiguous
+            line = "> {0:s}".format(self._text(10))
+            lines.append(line)
+            size += len(line) + 2
+
+        lines.append("")
+        return "\r\n".join(lines).encode("latin-1")
+
+    def _date(self) -> datetime:
+        return _start + timedelta(seconds=self.random.randrange(20 * 365 * 86400))
+
+    def _write_pmm(self, name: str, count: int):
+        data = [b"\x00" * 128]
+        index = []
+        offset = 128
+
+        for _ in range(count):
+            date = self._date()
+            value = self.message(date)
+            index.append(pack_record(0, offset, len(value), date))
+            data.append(value)
+            data.append(b"\x1a")
+            offset += len(value) + 1
+
+        self._write(name + ".PMM", data)
+        self._write(name + ".PMI", index)
+        return
+
+    def _write_mbx(self, name: str, count: int):
+        data = []
+        index = []
+        offset = 0
+
+        for _ in range(count):
+            date = self._date()
+            value = date.strftime("From ???@??? %a %b %d %H:%M:%S %Y\r\n").encode("ascii") + self.message(date)
+            index.append(pack_record(0, offset, len(value), date))
+            data.append(value)
+            data.append(b"\r\n")
+            offset += len(value) + 2
+
+        self._write(name + ".MBX", data)
+        self._write(name + ".PMG", index)
+        return
+
+    def _write(self, filename: str, data: List[bytes]):
+        value = b"".join(data)
+        self.size += len(value)
+
+        f = open(os.path.join(self.path, filename), mode="wb")
+        f.write(value)
+        f.close()
+        return
+
+    def _write_hierarchy(self):
+        lines = ['2,0,"BOX00001:My mailbox","","My mailbox"']
+
+        for _tray in range(self.scale.trays):
+            lines.append('1,0,"TRAY{0:04d}:Tray {0:d}","BOX00001:My mailbox","Tray {0:d}"'.format(_tray))
+
+        for _number in range(self.scale.folders):
+            tray = _number % max(self.scale.trays, 1)
+            ident = "F{0:07d}".format(_number)
+            name = "FOL{0:05d}".format(_number)
+            self.folders.append((ident, name))
+
+            if self.scale.trays == 0:
+                parent = "BOX00001:My mailbox"
+            else:
+                parent = "TRAY{0:04d}:Tray {0:d}".format(tray)
+
+            lines.append('0,0,"{0:s}:X:{1:s}","{2:s}","Folder {3:d}"'.format(ident, name, parent, _number))
+
+        f = open(os.path.join(self.path, "HIERARCH.PM"), mode="w")
+        f.write("\n".join(lines))
+        f.write("\n")
+        f.close()
+        return
+
+    def _rule(self) -> str:
+        ident, name = self.random.choice(self.folders)
+        action = '{0:s} "{1:s}:X:{2:s}"'.format(self.random.choice(["Copy", "Move"]), ident, name)
+
+        kind = self.random.randrange(6)
+
+        if kind == 0:
+            return 'If header "F" contains "{0:s}" {1:s}'.format(self._address(), action)
+
+        if kind == 1:
+            return 'If header "S" is "{0:s}" {1:s}'.format(self._text(4), action)
+
+        if kind == 2:
+            return 'If header "TC" contains "{0:s}" {1:s}'.format(self.random.choice(_domains), action)
+
+        if kind == 3:
+            return 'If size {0:s} {1:d} {2:s}'.format(self.random.choice([">", "<"]),
+                                                      self.random.randrange(self.scale.size * 2), action)
+
+        if kind == 4:
+            return 'If age older than {0:d} {1:s}'.format(self.random.randrange(20 * 365), action)
+
+        return 'If expression headers matches "Subject: *{0:s}*" {1:s}'.format(self.random.choice(_words), action)
+
+    def _write_filter(self):
+        rules = []
+        if len(self.folders) != 0:
+            for _ in range(self.scale.rules):
+                rules.append(self._rule())
+
+        f = open(os.path.join(self.path, "WINRULEA.PMC"), mode="w")
+        f.write("\n".join(rules))
+        f.write("\n")
+        f.close()
+
+        f = open(os.path.join(self.path, "WINRULES.PMC"), mode="w")
+        f.write('Always MarkRead ""\n')
+        f.close()
+        return
+
+    def create(self):
+        os.makedirs(self.path, exist_ok=True)
+
+        self._write_hierarchy()
+
+        for _ident, _name in self.folders:
+            if self.random.random() < self.scale.unix:
+                self._write_mbx(_name, self.scale.messages)
+            else:
+                self._write_pmm(_name, self.scale.messages)
+            self.count += self.scale.messages
+
+        self._write_filter()
+        return
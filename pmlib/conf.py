@@ -33,6 +33,21 @@ class Config(object):
     target_type: Target = Target.unknown
     target_path: str = ""
     no_convert: bool = False
+    use_mmap: bool = False
+    block_size: int = 0
+    jobs: int = 1
+    passthrough: bool = False
+    use_index: bool = False
+    route: bool = False
+    simulate: bool = False
+    metrics_path: str = ""
+    details: bool = False
+    resume: bool = False
+    delta: bool = False
+    watch: bool = False
+    watch_interval: int = 60
+    dedup: str = ""
+    progress: bool = True
 
     def parse(self, options) -> bool:
 
@@ -47,6 +62,54 @@ class Config(object):
         self.pegasus_root = options.root
         self.pegasus_path = options.folder
         self.no_convert = options.noconvert
+        self.use_mmap = options.mmap
+        self.block_size = int(options.blocksize)
+        self.jobs = int(options.jobs)
+        self.passthrough = options.passthrough
+        self.use_index = options.index
+        self.route = options.route
+        self.simulate = options.simulate
+        self.details = options.details
+        self.resume = options.resume
+        self.delta = options.delta
+        self.dedup = options.dedup
+        self.watch = options.watch
+        self.watch_interval = int(options.interval)
+
+        if (self.delta is True) or (self.watch is True):
+            self.resume = True
+
+        if (self.watch is True) and (self.simulate is True):
+            pmlib.log.error("Filter simulation can not be used with watch mode!")
+            return False
+
+        if self.watch_interval < 1:
+            pmlib.log.error("Invalid watch interval: {0:d}".format(self.watch_interval))
+            return False
+
+        if (self.route is True) and (self.jobs > 1):
+            pmlib.log.error("Filter routing can not be used with parallel jobs!")
+            return False
+
+        if (self.route is True) and (self.simulate is True):
+            pmlib.log.error("Filter routing can not be used with filter simulation!")
+            return False
+
+        if (self.route is True) and (self.resume is True):
+            pmlib.log.error("Filter routing can not be used with resumed conversions!")
+            return False
+
+        if self.dedup not in ["", "skip", "link"]:
+            pmlib.log.error("Invalid deduplication mode: {0:s}".format(self.dedup))
+            return False
+
+        if (self.dedup != "") and (self.jobs > 1):
+            pmlib.log.error("Deduplication can not be used with parallel jobs!")
+            return False
+
+        if self.jobs < 1:
+            pmlib.log.error("Invalid number of jobs: {0:d}".format(self.jobs))
+            return False
 
         if options.target == "":
             pmlib.log.error("Need to give target path!")
@@ -54,6 +117,9 @@ class Config(object):
 
         self.target_path = os.path.abspath(os.path.normpath(options.target))
 
+        if options.metrics != "":
+            self.metrics_path = os.path.abspath(os.path.normpath(options.metrics))
+
         if options.export == "mbox":
             self.target_type = Target.mbox
 
@@ -64,6 +130,10 @@ class Config(object):
             pmlib.log.error("Invalid export format: {0:s}".format(options.export))
             return False
 
+        if (self.dedup == "link") and (self.target_type is not Target.maildir):
+            pmlib.log.error("Linking duplicates needs a maildir target!")
+            return False
+
         self.verbose = int(options.verbose)
 
         return True
@@ -17,14 +17,23 @@
 #
 
 from optparse import OptionParser
+from typing import Union
 
 import pmlib
 
 from pmlib import config
 
+from pmlib.convert import TargetBase
+from pmlib.dedup import Dedup
+from pmlib.glob import Data
 from pmlib.hierachy import Hierarchy
-from pmlib.utils import create_folder
+from pmlib.item import Item
+from pmlib.metrics import Metrics
+from pmlib.convert.router import Router
+from pmlib.convert.simulate import Simulation
+from pmlib.utils import create_folder, Timer
 from pmlib.report import Report
+from pmlib.watch import Watcher
 
 _filter = [
     "WINRULEA.PMC",
@@ -37,6 +46,7 @@ class Console(object):
     def __init__(self):
         usage = "usage: %prog [options] arg1 arg2"
         self.parser: OptionParser = OptionParser(usage=usage)
+        self.watcher: Union[Watcher, None] = None
         self.parser.add_option("-v", "--verbose", help="run verbose level [0..3]", type="int", metavar="1",
                                default=0)
         self.parser.add_option("-f", "--folder", help="pegasus mail folder", type="string", metavar="<FOLDER>",
@@ -54,6 +64,52 @@ class Console(object):
 
         self.parser.add_option("-n", "--noconvert", help="target path for export", action="store_true",
                                default=False)
+
+        self.parser.add_option("-m", "--mmap", help="memory map pegasus folders instead of reading them",
+                               action="store_true", default=False)
+
+        self.parser.add_option("-b", "--blocksize", help="stream pegasus folders in blocks of given size in KB",
+                               type="int", metavar="1024", default=0)
+
+        self.parser.add_option("-j", "--jobs", help="number of folders to convert in parallel", type="int",
+                               metavar="1", default=1)
+
+        self.parser.add_option("-p", "--passthrough",
+                               help="write original mail data without parsing, with mboxrd escaping",
+                               action="store_true", default=False)
+
+        self.parser.add_option("--experimental-index",
+                               help="use PMG index files to locate mails in MBX folders, unverified",
+                               action="store_true", dest="index", default=False)
+
+        self.parser.add_option("-R", "--route", help="move and copy mails by the Pegasus filter rules",
+                               action="store_true", default=False)
+
+        self.parser.add_option("-S", "--simulate-filters",
+                               help="count filter rule hits without converting, read from the index only with "
+                                    "--experimental-index and rule sets on mail size, age and date",
+                               action="store_true", dest="simulate", default=False)
+
+        self.parser.add_option("-D", "--details", help="add a sheet with every mail to the Excel report",
+                               action="store_true", default=False)
+
+        self.parser.add_option("-u", "--resume", "--incremental", help="skip folders unchanged since the last run",
+                               action="store_true", dest="resume", default=False)
+
+        self.parser.add_option("-d", "--delta", help="only convert mails appended since the last run, implies resume",
+                               action="store_true", default=False)
+
+        self.parser.add_option("--dedup", help="skip mails already converted, or hard link them in maildir targets",
+                               type="string", metavar="skip|link", default="")
+
+        self.parser.add_option("-w", "--watch", help="keep running and convert changed folders",
+                               action="store_true", default=False)
+
+        self.parser.add_option("--interval", help="seconds between two polls in watch mode", type="int",
+                               metavar="60", default=60)
+
+        self.parser.add_option("-M", "--metrics", help="folder for run metrics in Prometheus and JSON format",
+                               type="string", metavar="<FOLDER>", default="")
         return
 
     def prepare(self) -> bool:
@@ -69,29 +125,117 @@ class Console(object):
         pmlib.log.inform("Root Mailbox", "{0:s}".format(config.pegasus_root))
         pmlib.log.inform("Target folder", "{0:s}".format(config.target_path))
 
+        if config.use_index is True:
+            pmlib.log.warn("Index", "PMG record layout is not verified against Pegasus, folders are scanned "
+                                    "where an index does not match")
+
         check = create_folder(config.target_path)
         if check is False:
             pmlib.log.error("Unable to create target folder!")
             return False
 
+        if config.watch is True:
+            # changes during the first run are picked up by the first poll
+            self.watcher = Watcher(config.pegasus_path, config.watch_interval)
+            self.watcher.start()
+
+        return True
+
+    @staticmethod
+    def _log_dedup():
+        duplicates = 0
+        linked = 0
+
+        for _item in pmlib.data.entries:
+            duplicates += _item.report.duplicates
+            linked += _item.report.linked
+
+        pmlib.log.inform("Dedup", "{0:d} duplicates, {1:d} linked".format(duplicates, linked))
+        return
+
+    @staticmethod
+    def _convert(target: TargetBase, item: Item) -> bool:
+        lfilter = pmlib.data.filter
+
+        engine = None
+        if (config.simulate is True) or (config.route is True):
+            engine = lfilter.compile()
+
+            # a guessed rule flow would route mails silently wrong
+            rules = engine.unsupported
+            if len(rules) != 0:
+                for _rule in rules:
+                    text = "{0:s} in {1:s} is not supported".format(_rule.action.result(), _rule.filename)
+                    pmlib.log.warn("Filter", text)
+                pmlib.log.error("Rule set uses labels, unable to apply filters!")
+                return False
+
+        if config.simulate is True:
+            simulation = Simulation(engine)
+            check = simulation.run(item)
+            return check
+
+        router = None
+        if config.route is True:
+            router = Router(engine, target)
+            pmlib.manager.set_router(router)
+
+        check = target.prepare(item)
+        if check is False:
+            return False
+
+        dedup = None
+        if config.dedup != "":
+            dedup = Dedup(config.target_path)
+            if dedup.open(config.resume) is False:
+                return False
+            pmlib.manager.set_dedup(dedup)
+
+        # also after a failed or interrupted run, so the next one resumes from here
+        try:
+            check = target.run()
+        finally:
+            if router is not None:
+                router.close()
+
+            if dedup is not None:
+                pmlib.manager.set_dedup(None)
+                dedup.close()
+                Console._log_dedup()
+
+            if target.write_manifest() is False:
+                check = False
+
+        if check is False:
+            return False
+
+        check = target.close()
+        if check is False:
+            return False
+
         return True
 
     @staticmethod
     def run() -> bool:
         hierarchy = Hierarchy()
 
+        timer = Timer()
         count = hierarchy.parse()
+        pmlib.data.add_phase("hierarchy", timer)
+
         if count == 0:
             return False
 
+        timer = Timer()
         hierarchy.sort()
+        pmlib.data.add_phase("sort", timer)
 
+        timer = Timer()
         for _item in _filter:
             check = pmlib.data.filter.parse(_item)
             if check is False:
                 return False
-
-        lfilter = pmlib.data.filter
+        pmlib.data.add_phase("filter", timer)
 
         item = pmlib.data.root
 
@@ -104,19 +248,10 @@ class Console(object):
         if config.no_convert is True:
             return True
 
-        check = target.prepare(item)
-        if check is False:
-            return False
-
-        check = target.run()
-        if check is False:
-            return False
-
-        check = target.close()
-        if check is False:
-            return False
-
-        return True
+        timer = Timer()
+        check = Console._convert(target, item)
+        pmlib.data.add_phase("convert", timer)
+        return check
 
     @staticmethod
     def close() -> bool:
@@ -125,10 +260,67 @@ class Console(object):
 
         report.init()
 
+        timer = Timer()
         for _report in report.modules:
             pmlib.log.inform(_report.name, _report.desc)
             check = _report.create()
             if check is False:
                 return False
+        pmlib.data.add_phase("report", timer)
 
+        for _phase in pmlib.data.phases:
+            pmlib.log.inform("Phase", "{0:s}: {1:.3f}s (CPU {2:.3f}s)".format(_phase.name, _phase.wall, _phase.cpu))
         return True
+
+    @staticmethod
+    def write_metrics(result: bool) -> bool:
+        if config.metrics_path == "":
+            return True
+
+        # also for failed runs, so a failed run does not look like the last good one
+        metrics = Metrics()
+        metrics.collect(result)
+
+        check = metrics.write(config.metrics_path)
+        return check
+
+    def watch(self) -> bool:
+        if config.watch is False:
+            return True
+
+        target = pmlib.manager.get_target(config.target_type)
+
+        text = "Poll {0:s} every {1:d}s, stop with Ctrl+C".format(config.pegasus_path, config.watch_interval)
+        pmlib.log.inform("Watch", text)
+
+        while True:
+            names = self.watcher.wait()
+            if names is None:
+                return True
+
+            pmlib.log.inform("Watch", "{0:d} files changed".format(len(names)))
+
+            # folders of the last hierarchy, or all of them if the hierarchy changed
+            target.changed = self.watcher.get_folders(names)
+            pmlib.data = Data()
+
+            # a failed cycle is tried again with the next poll, only Ctrl+C ends watching
+            check = False
+            try:
+                check = self.run()
+                if check is True:
+                    check = self.close()
+            except KeyboardInterrupt:
+                pmlib.log.inform("Watch", "Stopped during conversion")
+                return True
+            except Exception as e:
+                pmlib.log.exception(e)
+            finally:
+                self.write_metrics(check)
+                target.changed = None
+
+            if check is False:
+                pmlib.log.warn("Watch", "Conversion failed, try again with the next poll")
+                continue
+
+            self.watcher.commit(names)
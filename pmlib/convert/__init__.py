@@ -16,20 +16,33 @@
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
 
+import os
 import abc
+import copy
 import mailbox
 
 from abc import ABCMeta
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from typing import Union, List
+from typing import Union, List, Tuple, Dict, Set, Callable, Any
 
-from pmlib.types import Target, Source
+import pmlib
+
+from email.message import Message
+
+from pmlib.types import Target, Source, MailStatus
+from pmlib.dedup import Dedup
 from pmlib.item import Item
+from pmlib.manifest import Manifest, ManifestEntry, reset_target
+from pmlib.utils import escape_from
+from pmlib.filter.engine import get_date
 from bbutil.utils import get_attribute
 
 __all__ = [
     "source",
     "target",
+    "router",
+    "simulate",
 
     "SourceBase",
     "TargetBase",
@@ -41,8 +54,106 @@ class SourceBase(metaclass=ABCMeta):
 
     def __init__(self):
         self.source: Source = Source.unknown
+        self.router: Any = None
+        self.dedup: Union[Dedup, None] = None
+        return
+
+    def get_boxes(self, item: Item, box: mailbox.Mailbox, value) -> List[mailbox.Mailbox]:
+        if self.router is None:
+            return [box]
+
+        boxes = self.router.get_boxes(item, box, value)
+        if (box is not None) and (box not in boxes):
+            item.report.routed += 1
+        return boxes
+
+    @staticmethod
+    def add_detail(item: Item, value, msg: Union[Message, None], status: MailStatus):
+        if pmlib.config.details is False:
+            return
+
+        # passthrough mails are not parsed, so their date stays unknown
+        timestamp = 0
+        if msg is not None:
+            date = get_date(msg)
+            if date is not None:
+                try:
+                    timestamp = int(date.timestamp())
+                except (OverflowError, OSError, ValueError):
+                    timestamp = 0  # out of range for the platform, keep it unknown
+
+        item.report.add_mail(len(value), timestamp, status)
+        return
+
+    @staticmethod
+    def add_raw(box: mailbox.Mailbox, value: bytes, from_line: bytes = b"") -> str:
+        value = value.replace(b"\r\n", b"\n")  # mailbox converts to os.linesep itself
+
+        # mboxrd, lines starting with ">From " get one more ">". The parsed path only escapes "From " lines,
+        # so mails with ">From " lines in the body differ between both, all others come out the same.
+        if isinstance(box, mailbox.mbox):
+            value = escape_from(value)
+            if from_line != b"":
+                value = from_line + b"\n" + value
+
+        key = box.add(value)
+        return key
+
+    def add_box(self, box: mailbox.Mailbox, value, msg: Union[Message, None], from_line: bytes = b"") -> str:
+        if msg is None:
+            key = self.add_raw(box, bytes(value), from_line)
+        else:
+            key = box.add(msg)
+        return key
+
+    def _add_duplicate(self, item: Item, boxes: List[mailbox.Mailbox], value, msg: Union[Message, None],
+                       from_line: bytes, digest: bytes, path: str):
+        item.report.duplicates += 1
+        if pmlib.config.dedup == "skip":
+            self.dedup.skip(digest, item.id)
+            return
+
+        for _box in boxes:
+            # hard link to the first copy, if that fails write the mail again
+            if (isinstance(_box, mailbox.Maildir) is True) and (path != ""):
+                if self.dedup.link(path, _box._path) is True:
+                    item.report.linked += 1
+                    continue
+
+            self.add_box(_box, value, msg, from_line)
+        return
+
+    def add_boxes(self, item: Item, boxes: List[mailbox.Mailbox], value, msg: Union[Message, None],
+                  from_line: bytes = b""):
+        if self.dedup is None:
+            for _box in boxes:
+                self.add_box(_box, value, msg, from_line)
+            return
+
+        # once per mail, a copy made by a filter rule is no duplicate of the mail itself
+        digest = self.dedup.get_hash(value)
+        path = self.dedup.find(digest)
+
+        if path is not None:
+            self._add_duplicate(item, boxes, value, msg, from_line, digest, path)
+            return
+
+        path = ""
+        for _box in boxes:
+            key = self.add_box(_box, value, msg, from_line)
+
+            if (path == "") and (isinstance(_box, mailbox.Maildir) is True):
+                path = os.path.join(_box._path, "new", key)  # where mailbox.Maildir.add puts plain messages
+
+        self.dedup.add(digest, item.id, path)
         return
 
+    def get_index(self, item: Item) -> Any:
+        return None
+
+    def check_offset(self, item: Item, offset: int) -> bool:
+        return False
+
     @abc.abstractmethod
     def read(self, item: Item, box: mailbox.Mailbox) -> bool:
         pass
@@ -53,8 +164,150 @@ class TargetBase(metaclass=ABCMeta):
     def __init__(self):
         self.root: Union[Item, None] = None
         self.target: Target = Target.unknown
+        self.manifest: Union[Manifest, None] = None
+        self._states: Dict[str, ManifestEntry] = {}
+        self.changed: Union[Set[str], None] = None  # folder ids to look at, all if None
+        self._boxes: Dict[str, mailbox.Mailbox] = {}
+        return
+
+    def _open_manifest(self) -> bool:
+        self.manifest = Manifest(pmlib.config.target_path, self.target)
+        self._states = {}
+
+        if pmlib.config.resume is False:
+            return True
+
+        check = self.manifest.load()
+        return check
+
+    def _skip_folder(self, item: Item, path: str) -> bool:
+        item.offset = 0
+
+        if (self.changed is not None) and (item.id not in self.changed):
+            if (pmlib.config.resume is True) and (self.manifest.is_complete(item, path) is True):
+                self.manifest.restore(item)
+                return True
+
+        state = Manifest.get_state(item.data.filename)
+        self._states[item.id] = state
+
+        if pmlib.config.resume is False:
+            return False
+
+        if self.manifest.is_done(item, state, path) is True:
+            self.manifest.restore(item)
+            pmlib.log.inform(item.name, "Folder is unchanged, skip it")
+            return True
+
+        if pmlib.config.delta is True:
+            offset = self.manifest.get_offset(item, state, path)
+            source = pmlib.manager.get_source(item.data.type)
+
+            if (offset != 0) and (source.check_offset(item, offset) is True):
+                item.offset = offset
+                pmlib.log.inform(item.name, "Folder has grown, convert mails after byte {0:d}".format(offset))
+                return False
+
+        # half written or outdated, start this folder over
+        if os.path.exists(path):
+            reset_target(path)
+
+        if pmlib.manager.dedup is not None:
+            self._remove_dedup(item)
+        return False
+
+    def _remove_dedup(self, item: Item):
+        folders = pmlib.manager.dedup.remove(item.id)
+        if len(folders) == 0:
+            return
+
+        # their mails were skipped as duplicates of mails in this folder, which may be gone now
+        for _id in folders:
+            self.manifest.reset(_id)
+
+        text = "{0:d} folders with duplicates of its mails have to be converted again".format(len(folders))
+        pmlib.log.inform(item.name, text)
+        return
+
+    def _set_done(self, item: Item, path: str):
+        if pmlib.manager.dedup is not None:
+            pmlib.manager.dedup.commit()
+
+        state = self._states.pop(item.id, None)
+        self.manifest.set_done(item, state, path)
+        return
+
+    def _run_parallel(self, worker: Callable, folders: List[Tuple[Item, str]]) -> bool:
+        result = True
+
+        config = copy.copy(pmlib.config)
+        config.progress = False
+
+        with ProcessPoolExecutor(max_workers=pmlib.config.jobs) as executor:
+            futures = {}
+
+            for _item, _path in folders:
+                if self._skip_folder(_item, _path) is True:
+                    continue
+
+                future = executor.submit(worker, config, _item.detach(), _path)
+                futures[future] = (_item, _path)
+
+            for future in as_completed(futures):
+                _item, _path = futures[future]
+
+                if future.cancelled() is True:
+                    continue
+
+                try:
+                    check, _result = future.result()
+                except Exception as e:
+                    pmlib.log.exception(e)
+                    check = False
+                else:
+                    _item.size = _result.size
+                    _item.report = _result.report
+
+                if check is False:
+                    # same as the serial run, stop at the first failed folder
+                    if result is True:
+                        pmlib.log.error("Conversion of {0:s} failed, cancel remaining folders".format(_item.name))
+                        for _future in futures:
+                            _future.cancel()
+                    result = False
+                    continue
+
+                self._set_done(_item, _path)
+
+        return result
+
+    def write_manifest(self) -> bool:
+        if self.manifest is None:
+            return True
+
+        check = self.manifest.write(True)
+        return check
+
+    def get_box(self, item: Item) -> mailbox.Mailbox:
+        # one box per folder, shared by the router and the conversion of the folder itself
+        box = self._boxes.get(item.id, None)
+        if box is None:
+            box = self._open_box(item)
+            box.lock()
+            self._boxes[item.id] = box
+        return box
+
+    def close_boxes(self):
+        for _box in self._boxes.values():
+            _box.close()
+
+        self._boxes = {}
         return
 
+    @abc.abstractmethod
+    def _open_box(self, item: Item) -> mailbox.Mailbox:
+        pass
+
     @abc.abstractmethod
     def prepare(self, root: Item) -> bool:
         pass
@@ -73,6 +326,7 @@ class Manager(object):
     def __init__(self):
         self.source: List[SourceBase] = []
         self.target: List[TargetBase] = []
+        self.dedup: Union[Dedup, None] = None
 
         import pmlib.convert.source
         for _item in pmlib.convert.source.__all__:
@@ -99,6 +353,17 @@ class Manager(object):
             self.target.append(attr())
         return
 
+    def set_router(self, router: Any):
+        for _item in self.source:
+            _item.router = router
+        return
+
+    def set_dedup(self, dedup: Union[Dedup, None]):
+        self.dedup = dedup
+        for _item in self.source:
+            _item.dedup = dedup
+        return
+
     def get_source(self, source: Source) -> Union[None, SourceBase]:
         for _item in self.source:
             if _item.source is source:
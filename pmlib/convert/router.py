@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import mailbox
+
+from email.parser import HeaderParser
+from typing import List
+
+from pmlib.convert import TargetBase
+from pmlib.filter.action.folder import Copy, Move
+from pmlib.filter.action.mail import Delete
+from pmlib.filter.engine import Engine, get_headers
+from pmlib.item import Item
+from pmlib.types import Entry
+
+__all__ = [
+    "Router"
+]
+
+
+class Router(object):
+
+    def __init__(self, engine: Engine, target: TargetBase):
+        self.engine: Engine = engine
+        self.target: TargetBase = target
+        self._parser: HeaderParser = HeaderParser()
+        return
+
+    def get_boxes(self, item: Item, box: mailbox.Mailbox, value) -> List[mailbox.Mailbox]:
+        # only the headers are parsed, the body stays undecoded unless a rule searches it
+        if self.engine.use_body is True:
+            headers = self._parser.parsestr(str(value, "ascii", "surrogateescape"))
+        else:
+            headers = self._parser.parsestr(get_headers(value))
+        rules = self.engine.match(headers, len(value))
+
+        boxes = [box]
+
+        for _rule in rules:
+            action = _rule.action
+            if isinstance(action, Delete):
+                # copies made before stay, the mail itself is dropped
+                boxes.remove(box)
+                break
+
+            if isinstance(action, (Copy, Move)) is False:
+                continue
+
+            folder = action.folder
+            if (folder is item) or (folder.type is not Entry.folder):
+                if isinstance(action, Move):
+                    break
+                continue
+
+            folder_box = self.target.get_box(folder)
+            if folder_box not in boxes:
+                boxes.append(folder_box)
+                folder.report.routed_in += 1
+
+            if isinstance(action, Move):
+                boxes.remove(box)
+                break
+
+        return boxes
+
+    def close(self):
+        self.target.close_boxes()
+        return
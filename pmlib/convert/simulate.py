@@ -0,0 +1,241 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import copy
+import mailbox
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from email.parser import HeaderParser
+from typing import List, Tuple
+
+import pmlib
+
+from pmlib.conf import Config
+from pmlib.filter.engine import Engine, get_headers
+from pmlib.item import Item
+from pmlib.types import Entry
+
+__all__ = [
+    "Simulation"
+]
+
+
+def _simulate_folder(config: Config, simulation, item: Item) -> Tuple[bool, Item, object]:
+    pmlib.config = config
+    pmlib.manager.set_router(simulation)
+
+    source = pmlib.manager.get_source(item.data.type)
+
+    try:
+        check = False
+        if (config.use_index is True) and (simulation.engine.is_metadata is True):
+            check = simulation.read_index(source, item)
+
+        if check is False:
+            check = source.read(item, None)
+    finally:
+        pmlib.manager.set_router(None)
+    return check, item, simulation
+
+
+class Simulation(object):
+
+    def __init__(self, engine: Engine):
+        self.engine: Engine = engine
+
+        count = len(engine.rules)
+        self.hits: array = array("Q", bytes(8 * count))
+        self.first: array = array("Q", bytes(8 * count))
+        self.reached: array = array("Q", bytes(8 * count))
+
+        self._parser: HeaderParser = HeaderParser()
+        return
+
+    def detach(self):
+        simulation = copy.copy(self)
+        simulation.engine = self.engine.detach()
+        simulation.hits = array("Q", bytes(8 * len(self.hits)))
+        simulation.first = array("Q", bytes(8 * len(self.first)))
+        simulation.reached = array("Q", bytes(8 * len(self.reached)))
+        return simulation
+
+    def merge(self, simulation):
+        for _number in range(len(self.hits)):
+            self.hits[_number] += simulation.hits[_number]
+            self.first[_number] += simulation.first[_number]
+            self.reached[_number] += simulation.reached[_number]
+        return
+
+    def get_boxes(self, item: Item, box: mailbox.Mailbox, value) -> List[mailbox.Mailbox]:
+        if self.engine.use_body is True:
+            headers = self._parser.parsestr(str(value, "ascii", "surrogateescape"))
+        else:
+            headers = self._parser.parsestr(get_headers(value))
+        found = self.engine.match_numbers(headers, len(value))
+
+        reached = []
+        numbers = self.engine.walk(set(found), reached)
+
+        if len(numbers) != 0:
+            self.first[numbers[0]] += 1
+
+        for _number in found:
+            self.hits[_number] += 1
+
+        for _number in reached:
+            self.reached[_number] += 1
+
+        return []
+
+    def read_index(self, source, item: Item) -> bool:
+        index = source.get_index(item)
+        if index is None:
+            return False
+
+        masks = self.engine.match_index(index.lengths, index.dates)
+
+        for _number, _mask in masks.items():
+            self.hits[_number] += _mask.count(1)
+
+        # the masks are used as bitsets, so the rule set is walked for the whole folder at once
+        waiting = int.from_bytes(b"\x01" * index.count, "little")
+        active = waiting
+        skip = 0
+
+        for _numbers, _flow in self.engine.chains:
+            checked = active & ~skip
+            taken = checked
+
+            for _number in _numbers:
+                value = int.from_bytes(masks.get(_number, bytes(index.count)), "little")
+                self.reached[_number] += bin(value & checked).count("1")
+                taken &= value
+
+            self.first[_numbers[0]] += bin(taken & waiting).count("1")
+            waiting &= ~taken
+
+            skip = 0
+            if _flow == "skip":
+                skip = taken
+
+            if _flow == "stop":
+                active &= ~taken
+
+        item.size = sum(index.sizes)
+        item.mail_count = index.count
+        item.report.count = index.count
+        item.report.success = index.count
+
+        count = "{0:d}".format(index.count).rjust(6, " ")
+        pmlib.log.inform(item.parent.name, "{0:s} mails for {1:s} from index".format(count, item.name))
+        return True
+
+    def _collect(self, item: Item, folders: List[Item]):
+        for _item in item.children:
+            if _item.type is Entry.folder:
+                folders.append(_item)
+            else:
+                self._collect(_item, folders)
+        return
+
+    def _run_parallel(self, config: Config, folders: List[Item]) -> bool:
+        result = True
+
+        config = copy.copy(config)
+        config.progress = False
+
+        with ProcessPoolExecutor(max_workers=config.jobs) as executor:
+            futures = {}
+
+            for _item in folders:
+                future = executor.submit(_simulate_folder, config, self.detach(), _item.detach())
+                futures[future] = _item
+
+            for future in as_completed(futures):
+                _item = futures[future]
+
+                try:
+                    check, _result, _simulation = future.result()
+                except Exception as e:
+                    pmlib.log.exception(e)
+                    result = False
+                    continue
+
+                _item.size = _result.size
+                _item.mail_count = _result.mail_count
+                _item.report = _result.report
+                self.merge(_simulation)
+
+                if check is False:
+                    result = False
+
+        return result
+
+    def _run_serial(self, config: Config, folders: List[Item]) -> bool:
+        result = True
+
+        for _item in folders:
+            check, _, _simulation = _simulate_folder(config, self.detach(), _item)
+            self.merge(_simulation)
+
+            if check is False:
+                result = False
+
+        return result
+
+    def _set_report(self):
+        for _number, _rule in enumerate(self.engine.rules):
+            _rule.report.hits = self.hits[_number]
+            _rule.report.first = self.first[_number]
+            _rule.report.reached = self.reached[_number]
+
+            if _rule.action is None:
+                _rule.report.status = "unused"
+                continue
+
+            if _rule.report.hits == 0:
+                _rule.report.status = "dead"
+                continue
+
+            if _rule.report.reached == 0:
+                _rule.report.status = "shadowed"
+        return
+
+    def run(self, root: Item) -> bool:
+        folders = []
+        self._collect(root, folders)
+
+        # the mails are only matched, never parsed as a whole
+        original = pmlib.config
+        config = copy.copy(original)
+        config.passthrough = True
+
+        pmlib.log.inform("Filter", "Simulate {0:d} rules for {1:d} folders".format(len(self.hits), len(folders)))
+
+        # the serial run replaces the config of this process, also restored if a folder fails
+        try:
+            if config.jobs > 1:
+                result = self._run_parallel(config, folders)
+            else:
+                result = self._run_serial(config, folders)
+        finally:
+            pmlib.config = original
+
+        self._set_report()
+        return result
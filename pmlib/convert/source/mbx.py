@@ -21,13 +21,15 @@ import mailbox
 import email
 
 from pathlib import Path
+from typing import Union, List, Tuple, Iterator, BinaryIO
 
 import pmlib
 
 from pmlib.convert import SourceBase
+from pmlib.index import IndexPMG
 from pmlib.item import Item
-from pmlib.types import Source
-from pmlib.utils import convert_bytes
+from pmlib.types import Source, MailStatus
+from pmlib.utils import Timer, FolderProgress, convert_bytes, read_positions
 
 __all__ = [
     "name",
@@ -36,6 +38,33 @@ __all__ = [
 
 name = "SourceMBX"
 
+_linesep = os.linesep.encode("ascii")
+
+
+def _join(lines: List[bytes]) -> bytes:
+    # the empty line before the next From_ line belongs to neither mail
+    if (len(lines) > 1) and (lines[-1] == _linesep):
+        lines.pop()
+    return b"".join(lines)
+
+
+def _iter_messages(f) -> Iterator[bytes]:
+    # same split as mailbox.mbox, which can only read a folder from its start. Line by line, so only one mail
+    # is in memory.
+    lines = []
+
+    for _line in f:
+        if _line.startswith(b"From "):
+            if len(lines) != 0:
+                yield _join(lines)
+            lines = [_line]
+        elif len(lines) != 0:
+            lines.append(_line)
+
+    if len(lines) != 0:
+        yield _join(lines)
+    return
+
 
 class SourceMBX(SourceBase):
 
@@ -56,44 +85,149 @@ class SourceMBX(SourceBase):
         f.close()
         return error_text
 
+    @staticmethod
+    def _read_index(item: Item) -> Union[Tuple[IndexPMG, BinaryIO], None]:
+        if item.data.indexname == "":
+            return None
+
+        index = IndexPMG(item.data.indexname)
+        check = index.parse()
+        if check is False:
+            return None
+
+        try:
+            f = open(item.data.filename, mode="rb")
+        except OSError as e:
+            pmlib.log.exception(e)
+            return None
+
+        check = index.check(f, 0)
+        if check is False:
+            pmlib.log.warn(item.name, "Folder index does not match folder, scan folder instead!")
+            f.close()
+            return None
+        return index, f
+
+    @staticmethod
+    def _split(value: bytes) -> Tuple[bytes, bytes]:
+        from_line, _, value = value.replace(_linesep, b"\n").partition(b"\n")
+        return from_line.rstrip(b"\r"), value
+
+    def get_index(self, item: Item) -> Union[IndexPMG, None]:
+        result = self._read_index(item)
+        if result is None:
+            return None
+
+        index, f = result
+        f.close()
+        return index
+
+    def check_offset(self, item: Item, offset: int) -> bool:
+        try:
+            f = open(item.data.filename, mode='rb')
+        except OSError as e:
+            pmlib.log.exception(e)
+            return False
+
+        # new mails have to start right at the end of the old folder
+        f.seek(offset)
+        value = f.read(5)
+        f.close()
+        return value == b"From "
+
     def read(self, item: Item, box: mailbox.Mailbox) -> bool:
+        timer = Timer()
 
         fs_info = Path(item.data.filename)
         item.size = fs_info.stat().st_size
 
-        mbx = mailbox.mbox(item.data.filename)
-        mbx.lock()
+        result = None
+        if pmlib.config.use_index is True:
+            result = self._read_index(item)
 
-        max_count = len(mbx)
+        if result is not None:
+            index, f = result
+            starts, ends = index.positions(item.offset)
+            max_count = len(ends)
+            messages = read_positions(f, starts, ends)
+        else:
+            try:
+                f = open(item.data.filename, mode="rb")
+            except OSError as e:
+                pmlib.log.exception(e)
+                return False
 
-        progress = pmlib.log.progress(max_count)
+            # no counting pass like len(mailbox.mbox), the mails are read one after the other
+            f.seek(item.offset)
+            max_count = -1
+            messages = _iter_messages(f)
 
-        count = "{0:d}".format(max_count).rjust(6, " ")
         size = convert_bytes(item.size)
 
-        pmlib.log.inform(item.parent.name,
-                         "{0:s} mails for {1:s} ({2:s})".format(count, item.name, size))
+        if max_count == -1:
+            # mail count is unknown while streaming, so the progress follows the bytes read
+            pmlib.log.inform(item.parent.name, "{0:s} streamed for {1:s}".format(size.rjust(10, " "), item.name))
+            progress = FolderProgress(max(item.size - item.offset, 1))
+        else:
+            item.mail_count = max_count
+            count = "{0:d}".format(max_count).rjust(6, " ")
+            pmlib.log.inform(item.parent.name,
+                             "{0:s} mails for {1:s} ({2:s})".format(count, item.name, size))
+            progress = FolderProgress(max_count)
 
         n = 0
-        for msg in mbx:
-            try:
-                box.add(msg)
-            except UnicodeEncodeError as e:
-                text = self._store_fault(item, n, msg)
-                item.add_error(n, text, e)
-                item.report.failure += 1
-            else:
+        for value in messages:
+            from_line, value = self._split(value)
+            boxes = self.get_boxes(item, box, value)
+            item.report.bytes_read += len(value)
+
+            status = MailStatus.success
+            if box not in boxes:
+                status = MailStatus.routed
+
+            if pmlib.config.passthrough is True:
+                self.add_boxes(item, boxes, value, None, from_line)
+                self.add_detail(item, value, None, status)
                 item.report.success += 1
-
-            box.flush()
-            progress.inc()
+            else:
+                # same as mailbox.mbox.get_message
+                msg = mailbox.mboxMessage(value)
+                msg.set_from(from_line[5:].decode("ascii"))
+                try:
+                    self.add_boxes(item, boxes, value, msg)
+                except UnicodeEncodeError as e:
+                    text = self._store_fault(item, n, msg)
+                    item.add_error(n, text, e)
+                    self.add_detail(item, value, msg, MailStatus.failure)
+                    item.report.failure += 1
+                else:
+                    self.add_detail(item, value, msg, status)
+                    item.report.success += 1
+
+            for _box in boxes:
+                _box.flush()
+
+            if max_count == -1:
+                progress.set(f.tell() - item.offset)
+            else:
+                progress.inc()
             n += 1
             item.report.count = n
 
-        pmlib.log.clear()
+        # while streaming, mails appended after the stat above are read as well. The index was checked against
+        # the folder as it was at the stat.
+        if max_count == -1:
+            item.report.offset = f.tell()
+        else:
+            item.report.offset = item.size
+        item.mail_count = n
+
+        progress.close()
+
+        item.report.wall, item.report.cpu = timer.stop()
 
         for _error in item.report.error:
             pmlib.log.error(_error.text)
 
-        mbx.unlock()
+        f.close()
         return True
@@ -17,17 +17,19 @@
 #
 
 import os
+import mmap
 import mailbox
 import email
+import traceback
 
-from typing import List
+from typing import Union
 
 import pmlib
 
 from pmlib.convert import SourceBase
 from pmlib.item import Item
-from pmlib.types import Source, Position
-from pmlib.utils import convert_bytes
+from pmlib.types import Source, MailStatus
+from pmlib.utils import Timer, FolderProgress, convert_bytes, get_positions, iter_messages
 
 __all__ = [
     "name",
@@ -36,6 +38,8 @@ __all__ = [
 
 name = "SourcePMM"
 
+_header = 128
+
 
 class SourcePMM(SourceBase):
 
@@ -56,64 +60,145 @@ class SourcePMM(SourceBase):
         f.close()
         return error_text
 
-    def read(self, item: Item, box: mailbox.Mailbox) -> bool:
+    @staticmethod
+    def _map(f) -> Union[mmap.mmap, None]:
+        if os.fstat(f.fileno()).st_size <= _header:
+            return None
+
+        try:
+            stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            pmlib.log.exception(e)
+            return None
+        return stream
+
+    def check_offset(self, item: Item, offset: int) -> bool:
+        if offset <= _header:
+            return False
+
         try:
             f = open(item.data.filename, mode='rb')
         except OSError as e:
             pmlib.log.exception(e)
             return False
 
-        f.seek(128)  # move to first mail
+        # the last converted mail has to end with its separator
+        f.seek(offset - 1)
+        value = f.read(1)
+        f.close()
+        return value == b"\x1a"
 
-        n = 0
-        count = 1
+    def read(self, item: Item, box: mailbox.Mailbox) -> bool:
+        timer = Timer()
 
-        stream = f.read(-1)
-        item.size = len(stream)
-        positions: List[Position] = []
+        try:
+            f = open(item.data.filename, mode='rb')
+        except OSError as e:
+            pmlib.log.exception(e)
+            return False
 
-        start = 0
-        for byte in stream:
-            if byte == 0x1a:  # 1A seperates the mails
-                pos = Position(start=start, end=n)
-                positions.append(pos)
-                count += 1
-                start = n + 1
-            n += 1
+        mapped = None
+        if pmlib.config.use_mmap is True:
+            mapped = self._map(f)
+
+        start = max(_header, item.offset)  # first mail, or the first new one in delta runs
+        item.size = max(os.fstat(f.fileno()).st_size - _header, 0)
+
+        if (mapped is None) and (pmlib.config.block_size > 0):
+            block_size = pmlib.config.block_size * 1024
+
+            # no counting pass, the first mail is written after reading one block
+            f.seek(start)
+            max_count = -1
+            messages = iter_messages(f, block_size)
+        else:
+            if mapped is None:
+                f.seek(start)
+                data = f.read(-1)
+                stream = data
+                base = start
+            else:
+                data = mapped
+                stream = memoryview(mapped)
+                base = 0
 
-        max_count = len(positions)
+            starts, ends = get_positions(data, start=start - base)  # 1A seperates the mails
+            max_count = len(ends)
+            messages = (stream[_start:_end] for _start, _end in zip(starts, ends))
 
-        count = "{0:d}".format(max_count).rjust(6, " ")
         size = convert_bytes(item.size)
 
-        pmlib.log.inform(item.parent.name,
-                         "{0:s} mails for {1:s} ({2:s})".format(count, item.name, size))
-
-        progress = pmlib.log.progress(max_count)
+        if max_count == -1:
+            # mail count is unknown while streaming, so the progress follows the bytes read
+            pmlib.log.inform(item.parent.name, "{0:s} streamed for {1:s}".format(size.rjust(10, " "), item.name))
+            progress = FolderProgress(max(item.size + _header - start, 1))
+        else:
+            item.mail_count = max_count
+            count = "{0:d}".format(max_count).rjust(6, " ")
+            pmlib.log.inform(item.parent.name,
+                             "{0:s} mails for {1:s} ({2:s})".format(count, item.name, size))
+            progress = FolderProgress(max_count)
 
         n = 0
-        for _pos in positions:
-            value = stream[_pos.start:_pos.end]
-
-            msg = email.message_from_bytes(value)
-            try:
-                box.add(msg)
-            except UnicodeEncodeError as e:
-                text = self._store_fault(item, n, value)
-                item.add_error(n, text, e)
-                item.report.failure += 1
-            else:
-                item.report.success += 1
-
-            box.flush()
-            progress.inc()
-            n += 1
-            item.report.count = n
+        offset = start
 
-        pmlib.log.clear()
+        # the map and the file are closed also if writing a mail fails, watch mode would keep them open
+        try:
+            for value in messages:
+                boxes = self.get_boxes(item, box, value)
+                item.report.bytes_read += len(value)
+                offset += len(value) + 1  # mails follow each other, each with its separator
+
+                status = MailStatus.success
+                if box not in boxes:
+                    status = MailStatus.routed
+
+                if pmlib.config.passthrough is True:
+                    self.add_boxes(item, boxes, value, None)
+                    self.add_detail(item, value, None, status)
+                    item.report.success += 1
+                else:
+                    # same as email.message_from_bytes, but works on memoryview slices without a copy
+                    msg = email.message_from_string(str(value, "ascii", "surrogateescape"))
+                    try:
+                        self.add_boxes(item, boxes, value, msg)
+                    except UnicodeEncodeError as e:
+                        text = self._store_fault(item, n, value)
+                        item.add_error(n, text, e)
+                        self.add_detail(item, value, msg, MailStatus.failure)
+                        item.report.failure += 1
+                    else:
+                        self.add_detail(item, value, msg, status)
+                        item.report.success += 1
+
+                for _box in boxes:
+                    _box.flush()
+
+                if max_count == -1:
+                    progress.set(offset - start)
+                else:
+                    progress.inc()
+                n += 1
+                item.report.count = n
+
+            item.report.offset = offset
+            item.mail_count = n
+        except BaseException as e:
+            # the frames of the traceback still hold slices of the map
+            traceback.clear_frames(e.__traceback__)
+            raise
+        finally:
+            progress.close()
+
+            if mapped is not None:
+                value = None  # drop the last slice, the map can not be closed while it is exported
+                stream.release()
+                mapped.close()
+
+            f.close()
+
+        item.report.wall, item.report.cpu = timer.stop()
 
         for _error in item.report.error:
             pmlib.log.error(_error.text)
-
-        f.close()
         return True
@@ -19,14 +19,15 @@
 import os
 import mailbox
 
-from typing import Union
+from typing import Union, List, Tuple
 
 import pmlib
 
+from pmlib.conf import Config
 from pmlib.convert import TargetBase
 from pmlib.item import Item, sort_items
 from pmlib.types import Target, Entry
-from pmlib.utils import clean_folder, create_folder
+from pmlib.utils import clean_folder, create_folder, get_size
 
 name = "TargetMaildir"
 
@@ -36,6 +37,26 @@ __all__ = [
 ]
 
 
+def _convert_folder(config: Config, item: Item, path: str) -> Tuple[bool, Item]:
+    pmlib.config = config
+
+    source = pmlib.manager.get_source(item.data.type)
+
+    # resumed and delta runs add to the folder of the last run
+    size = get_size(path)
+
+    maildir = mailbox.Maildir(path, create=False)
+    maildir.lock()
+
+    check = source.read(item, maildir)
+
+    maildir.flush()
+    maildir.unlock()
+
+    item.report.bytes_written = get_size(path) - size
+    return check, item
+
+
 class TargetMaildir(TargetBase):
 
     def __init__(self):
@@ -57,10 +78,14 @@ class TargetMaildir(TargetBase):
         f.close()
         return error_text
 
-    def _convert(self, item: Item, maildir: mailbox.Maildir) -> bool:
+    def _convert(self, item: Item, maildir: mailbox.Maildir, path: str) -> bool:
+        newpath = os.path.join(path, ".{0:s}".format(item.name))  # same as mailbox.Maildir.add_folder
 
         if item.type is Entry.folder:
-            newmaildir = maildir.add_folder(item.name)
+            # the router may already write to this folder, then its box is used
+            newmaildir = self._boxes.get(item.id, None)
+            if newmaildir is None:
+                newmaildir = maildir.add_folder(item.name)
             newmaildir.lock()
 
             source = pmlib.manager.get_source(item.data.type)
@@ -71,10 +96,23 @@ class TargetMaildir(TargetBase):
                 return True
 
             item.report.target_format = self.target
+
+            if self._skip_folder(item, newpath) is True:
+                newmaildir.unlock()
+                return True
+
+            # resumed and delta runs add to the folder of the last run, and routed mails may be in it already
+            size = get_size(newpath)
+
             check = source.read(item, newmaildir)
 
             newmaildir.flush()
             newmaildir.unlock()
+
+            item.report.bytes_written = get_size(newpath) - size
+
+            if check is True:
+                self._set_done(item, newpath)
             return check
         else:
             pmlib.log.inform("TRAY", item.full_name)
@@ -84,7 +122,7 @@ class TargetMaildir(TargetBase):
             # first convert folder
             for _item in sorted(item.children, key=sort_items):
                 if _item.type is Entry.folder:
-                    check = self._convert(_item, newmaildir)
+                    check = self._convert(_item, newmaildir, newpath)
                     if check is False:
                         return False
 
@@ -92,7 +130,7 @@ class TargetMaildir(TargetBase):
             for _item in sorted(item.children, key=sort_items):
                 if _item.type is not Entry.folder:
 
-                    check = self._convert(_item, newmaildir)
+                    check = self._convert(_item, newmaildir, newpath)
                     if check is False:
                         return False
 
@@ -102,11 +140,64 @@ class TargetMaildir(TargetBase):
 
         return True
 
+    def _create_skeleton(self, item: Item, maildir: mailbox.Maildir, path: str,
+                         folders: List[Tuple[Item, str]]):
+        newmaildir = maildir.add_folder(item.name)
+        newpath = os.path.join(path, ".{0:s}".format(item.name))  # same as mailbox.Maildir.add_folder
+
+        if item.type is Entry.folder:
+            source = pmlib.manager.get_source(item.data.type)
+            if source is None:
+                pmlib.log.warn(item.name,
+                               "Mailbox format is not yet implemented: {0:s}".format(item.data.type.name))
+                return
+
+            item.report.target_format = self.target
+            folders.append((item, newpath))
+            return
+
+        pmlib.log.inform("TRAY", item.full_name)
+
+        # first folder
+        for _item in sorted(item.children, key=sort_items):
+            if _item.type is Entry.folder:
+                self._create_skeleton(_item, newmaildir, newpath, folders)
+
+        # then trays
+        for _item in sorted(item.children, key=sort_items):
+            if _item.type is not Entry.folder:
+                self._create_skeleton(_item, newmaildir, newpath, folders)
+        return
+
+    def _convert_parallel(self) -> bool:
+        folders: List[Tuple[Item, str]] = []
+        self._create_skeleton(self.root, self.maildir, self.root.target, folders)
+
+        check = self._run_parallel(_convert_folder, folders)
+        return check
+
+    def _open_box(self, item: Item) -> mailbox.Maildir:
+        parents = []
+
+        _item = item
+        while _item is not None:
+            parents.insert(0, _item)
+            _item = _item.parent
+
+        box = self.maildir
+        for _item in parents:
+            box = box.add_folder(_item.name)
+        return box
+
     def prepare(self, root: Item) -> bool:
         self.root = root
         self.root.set_target()
 
-        if os.path.exists(self.root.target):
+        check = self._open_manifest()
+        if check is False:
+            return False
+
+        if (os.path.exists(self.root.target)) and (pmlib.config.resume is False):
             pmlib.log.inform("Mailbox", "Remove folder {0:s}".format(self.root.target))
             check = clean_folder(self.root.target)
             if check is False:
@@ -122,8 +213,11 @@ class TargetMaildir(TargetBase):
         return True
 
     def run(self) -> bool:
+        if pmlib.config.jobs > 1:
+            check = self._convert_parallel()
+            return check
 
-        check = self._convert(self.root, self.maildir)
+        check = self._convert(self.root, self.maildir, self.root.target)
         return check
 
     def close(self) -> bool:
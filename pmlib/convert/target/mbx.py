@@ -19,12 +19,15 @@
 import os
 import mailbox
 
+from typing import List, Tuple
+
 import pmlib
 
+from pmlib.conf import Config
 from pmlib.convert import TargetBase
 from pmlib.item import Item, sort_items
 from pmlib.types import Target, Entry
-from pmlib.utils import clean_folder, create_folder
+from pmlib.utils import clean_folder, create_folder, get_size
 
 name = "TargetMBOX"
 
@@ -34,6 +37,35 @@ __all__ = [
 ]
 
 
+class _AppendBox(mailbox.mbox):
+
+    # mails are only appended, mailbox.mbox would first read the whole folder for its table of contents.
+    # That made every delta run as slow as a full one.
+    def _generate_toc(self):
+        self._toc = {}
+        self._next_key = 0
+        return
+
+
+def _convert_folder(config: Config, item: Item, path: str) -> Tuple[bool, Item]:
+    pmlib.config = config
+
+    source = pmlib.manager.get_source(item.data.type)
+
+    # resumed and delta runs append to the folder of the last run
+    size = get_size(path)
+
+    mbox = _AppendBox(path)
+    mbox.lock()
+
+    check = source.read(item, mbox)
+
+    mbox.unlock()
+
+    item.report.bytes_written = get_size(path) - size
+    return check, item
+
+
 class TargetMBOX(TargetBase):
 
     def __init__(self):
@@ -54,12 +86,10 @@ class TargetMBOX(TargetBase):
         return error_text
 
     def _create_folder(self, item: Item) -> bool:
-        item.set_target()
-
         if item.type is Entry.folder:
             return True
 
-        if os.path.exists(item.target):
+        if (os.path.exists(item.target)) and (pmlib.config.resume is False):
             pmlib.log.inform("Mailbox", "Remove folder {0:s}".format(item.target))
             check = clean_folder(item.target)
             if check is False:
@@ -77,6 +107,48 @@ class TargetMBOX(TargetBase):
 
         return True
 
+    def _set_report(self, item: Item):
+        item.report.filename = "{0:s}.mbx".format(item.target)
+        item.report.target_format = self.target
+        return
+
+    def _collect(self, item: Item, folders: List[Item]):
+        if item.type is Entry.folder:
+            folders.append(item)
+            return
+
+        pmlib.log.inform("TRAY", item.full_name)
+
+        # first folder
+        for _item in sorted(item.children, key=sort_items):
+            if _item.type is Entry.folder:
+                self._collect(_item, folders)
+
+        # then trays
+        for _item in sorted(item.children, key=sort_items):
+            if _item.type is not Entry.folder:
+                self._collect(_item, folders)
+        return
+
+    def _convert_parallel(self) -> bool:
+        folders: List[Item] = []
+        self._collect(self.root, folders)
+
+        jobs = []
+
+        for _item in folders:
+            source = pmlib.manager.get_source(_item.data.type)
+            if source is None:
+                pmlib.log.warn(_item.name,
+                               "Mailbox format is not yet implemented: {0:s}".format(_item.data.type.name))
+                continue
+
+            self._set_report(_item)
+            jobs.append((_item, _item.report.filename))
+
+        check = self._run_parallel(_convert_folder, jobs)
+        return check
+
     def _convert(self, item: Item) -> bool:
 
         if item.type is Entry.folder:
@@ -87,16 +159,34 @@ class TargetMBOX(TargetBase):
                                "Mailbox format is not yet implemented: {0:s}".format(item.data.type.name))
                 return True
 
-            path = "{0:s}.mbx".format(item.target)
-            item.report.filename = path
-            item.report.target_format = self.target
+            self._set_report(item)
+
+            if self._skip_folder(item, item.report.filename) is True:
+                return True
+
+            # the router may already write to this folder, then its box is used
+            mbox = self._boxes.get(item.id, None)
+            if mbox is not None:
+                mbox.flush()
+
+            # resumed and delta runs append to the folder of the last run, and routed mails may be in it already
+            size = get_size(item.report.filename)
+
+            if mbox is None:
+                mbox = _AppendBox(item.report.filename)
+                mbox.lock()
 
-            mbox = mailbox.mbox(path)
-            mbox.lock()
+                check = source.read(item, mbox)
 
-            check = source.read(item, mbox)
+                mbox.unlock()
+            else:
+                check = source.read(item, mbox)
+                mbox.flush()
 
-            mbox.unlock()
+            item.report.bytes_written = get_size(item.report.filename) - size
+
+            if check is True:
+                self._set_done(item, item.report.filename)
             return check
         else:
             pmlib.log.inform("TRAY", item.full_name)
@@ -117,14 +207,27 @@ class TargetMBOX(TargetBase):
 
         return True
 
+    def _open_box(self, item: Item) -> mailbox.Mailbox:
+        box = _AppendBox("{0:s}.mbx".format(item.target))
+        return box
+
     def prepare(self, root: Item) -> bool:
         self.root = root
+        self.root.set_target()
+
+        check = self._open_manifest()
+        if check is False:
+            return False
+
         check = self._create_folder(self.root)
         if check is False:
             return False
         return True
 
     def run(self) -> bool:
+        if pmlib.config.jobs > 1:
+            check = self._convert_parallel()
+            return check
 
         check = self._convert(self.root)
         return check
@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import time
+import socket
+import sqlite3
+import hashlib
+
+from typing import List, Union
+
+import pmlib
+
+__all__ = [
+    "Bloom",
+    "Dedup"
+]
+
+_hashes = 7
+_bits_per_mail = 10
+_min_bits = 1 << 20
+
+
+class Bloom(object):
+
+    def __init__(self, bits: int):
+        self.bits: int = bits
+        self.data: bytearray = bytearray((bits + 7) // 8)
+        return
+
+    def _positions(self, digest: bytes) -> list:
+        # double hashing, both halves of the digest are independent enough
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:16], "little") | 1
+        return [(first + _number * second) % self.bits for _number in range(_hashes)]
+
+    def add(self, digest: bytes):
+        for _pos in self._positions(digest):
+            self.data[_pos >> 3] |= 1 << (_pos & 7)
+        return
+
+    def has(self, digest: bytes) -> bool:
+        for _pos in self._positions(digest):
+            if (self.data[_pos >> 3] & (1 << (_pos & 7))) == 0:
+                return False
+        return True
+
+
+class Dedup(object):
+
+    def __init__(self, path: str):
+        self.filename: str = os.path.join(path, "dedup.sqlite")
+        self.db: Union[sqlite3.Connection, None] = None
+        self.bloom: Bloom = Bloom(_min_bits)
+        self.count: int = 0
+        self.links: int = 0
+        return
+
+    @staticmethod
+    def get_hash(value: bytes) -> bytes:
+        # same mail from PMM and MBX folders, with CRLF or LF line ends
+        value = bytes(value).replace(b"\r\n", b"\n").rstrip()
+        return hashlib.blake2b(value, digest_size=16).digest()
+
+    def _fill(self):
+        bits = max(_min_bits, self.count * _bits_per_mail * 2)
+        self.bloom = Bloom(bits)
+
+        for (_digest,) in self.db.execute("SELECT hash FROM mails"):
+            self.bloom.add(_digest)
+        return
+
+    def open(self, keep: bool) -> bool:
+        if (keep is False) and (os.path.exists(self.filename) is True):
+            os.remove(self.filename)
+
+        try:
+            self.db = sqlite3.connect(self.filename)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS mails (hash BLOB PRIMARY KEY, folder TEXT, path TEXT)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS mails_folder ON mails (folder)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS skipped (hash BLOB, folder TEXT, PRIMARY KEY (hash, folder))")
+            self.count = self.db.execute("SELECT COUNT(*) FROM mails").fetchone()[0]
+        except sqlite3.Error as e:
+            pmlib.log.exception(e)
+            return False
+
+        self._fill()
+        pmlib.log.inform("Dedup", "{0:d} known mails".format(self.count))
+        return True
+
+    def find(self, digest: bytes) -> Union[str, None]:
+        # most mails are new, the bloom filter answers them without a query
+        if self.bloom.has(digest) is False:
+            return None
+
+        row = self.db.execute("SELECT path FROM mails WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def add(self, digest: bytes, folder: str, path: str):
+        self.db.execute("INSERT OR IGNORE INTO mails (hash, folder, path) VALUES (?, ?, ?)", (digest, folder, path))
+        self.bloom.add(digest)
+        self.count += 1
+
+        # too many mails for the filter, every lookup would end in a query
+        if self.count * _bits_per_mail > self.bloom.bits:
+            self._fill()
+        return
+
+    def skip(self, digest: bytes, folder: str):
+        self.db.execute("INSERT OR IGNORE INTO skipped (hash, folder) VALUES (?, ?)", (digest, folder))
+        return
+
+    def remove(self, folder: str) -> List[str]:
+        # other folders that skipped mails of this one, without them they lose these mails for good
+        cursor = self.db.execute("SELECT DISTINCT skipped.folder FROM skipped JOIN mails ON skipped.hash = mails.hash "
+                                 "WHERE mails.folder = ? AND skipped.folder != ?", (folder, folder))
+        folders = [_row[0] for _row in cursor.fetchall()]
+
+        # removed hashes stay in the bloom filter, they only cost a query
+        cursor = self.db.execute("DELETE FROM mails WHERE folder = ?", (folder,))
+        self.count -= cursor.rowcount
+
+        self.db.execute("DELETE FROM skipped WHERE folder = ?", (folder,))
+        return folders
+
+    def link(self, path: str, folder: str) -> bool:
+        # same naming as mailbox.Maildir, so the new file is a regular new mail
+        self.links += 1
+        name = "{0:d}.P{1:d}D{2:d}.{3:s}".format(int(time.time()), os.getpid(), self.links, socket.gethostname())
+
+        try:
+            os.link(path, os.path.join(folder, "new", name))
+        except OSError as e:
+            pmlib.log.warn("Dedup", "Unable to link {0:s}: {1:s}".format(path, str(e)))
+            return False
+        return True
+
+    def commit(self):
+        self.db.commit()
+        return
+
+    def close(self):
+        if self.db is None:
+            return
+
+        self.db.commit()
+        self.db.close()
+        self.db = None
+        return
@@ -18,18 +18,20 @@
 
 import os
 
-from typing import List, Union
+from typing import List, Union, Dict
 
 from bbutil.utils import get_attribute
 
 import pmlib
 
 from pmlib.filter.types import Rule
+from pmlib.filter.engine import Engine
 
 
 __all__ = [
     "action",
     "rules",
+    "engine",
     "types",
 
     "Filter"
@@ -39,7 +41,7 @@ __all__ = [
 class _Rules(object):
 
     def __init__(self):
-        self.modules: list = []
+        self.modules: Dict[str, List[type]] = {}
 
         import pmlib.filter.rules
 
@@ -49,9 +51,36 @@ class _Rules(object):
 
             for _class in class_list:
                 attr = get_attribute(path, _class)
-                self.modules.append(attr)
+                rule: Rule = attr()
+                self.modules.setdefault(rule.keyword, []).append(attr)
         return
 
+    @staticmethod
+    def _get_keyword(line: str) -> str:
+        words = line.split(None, 2)
+        if len(words) == 0:
+            return ""
+
+        if (words[0] == "If") and (len(words) > 1):
+            return "{0:s} {1:s}".format(words[0], words[1])
+        return words[0]
+
+    def get(self, line: str) -> List[type]:
+        keyword = self._get_keyword(line)
+        modules = self.modules.get(keyword, [])
+        return modules
+
+
+_rules: Union[_Rules, None] = None
+
+
+def _get_rules() -> _Rules:
+    global _rules
+
+    if _rules is None:
+        _rules = _Rules()
+    return _rules
+
 
 class Filter(object):
 
@@ -63,9 +92,13 @@ class Filter(object):
     def count(self) -> int:
         return len(self.rules)
 
+    def compile(self) -> Engine:
+        engine = Engine(self.rules)
+        return engine
+
     def parse(self, filename: str) -> bool:
 
-        _rules = _Rules()
+        rules = _get_rules()
         path = os.path.abspath(os.path.normpath("{0:s}/{1:s}").format(pmlib.config.pegasus_path, filename))
 
         if os.path.exists(path) is False:
@@ -87,7 +120,7 @@ class Filter(object):
                 if check is True:
                     continue
 
-            for attr in _rules.modules:
+            for attr in rules.get(line):
                 rule: Rule = attr()
 
                 check = rule.parse(line)
@@ -35,6 +35,8 @@ __all__ = [
     "MarkSignificant"
 ]
 
+_mark_read = re.compile("MarkRead \"\"")
+
 
 class Print(Action):
 
@@ -75,12 +77,10 @@ class MarkRead(Action):
         Action.__init__(self)
         self.name = "MarkRead"
         self.filter = "MarkRead"
-
-        self._pattern = re.compile("MarkRead \"\"")
         return
 
     def parse(self, data: str) -> bool:
-        m = self._pattern.search(data)
+        m = _mark_read.search(data)
         if m is None:
             return False
 
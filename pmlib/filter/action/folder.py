@@ -32,6 +32,8 @@ __all__ = [
 
 
 _folder = re.compile("(?P<ID>.+):(?P<Folder>.+):(?P<Name>.+)")
+_copy = re.compile("Copy \"(?P<Folder>.+)\"")
+_move = re.compile("Move \"(?P<Folder>.+)\"")
 
 
 class Copy(Action):
@@ -41,12 +43,10 @@ class Copy(Action):
         self.name = "Copy"
         self.filter = "Copy"
         self.folder: Union[Folder, None] = None
-
-        self._pattern = re.compile("Copy \"(?P<Folder>.+)\"")
         return
 
     def parse(self, data: str) -> bool:
-        m = self._pattern.search(data)
+        m = _copy.search(data)
         if m is None:
             return False
 
@@ -78,12 +78,10 @@ class Move(Action):
         self.name = "Move"
         self.filter = "Move"
         self.folder: Union[Folder, None] = None
-
-        self._pattern = re.compile("Move \"(?P<Folder>.+)\"")
         return
 
     def parse(self, data: str) -> bool:
-        m = self._pattern.search(data)
+        m = _move.search(data)
         if m is None:
             return False
 
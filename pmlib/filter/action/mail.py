@@ -16,6 +16,7 @@
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
 
+import re
 
 from pmlib.filter.types import Action
 
@@ -27,6 +28,8 @@ __all__ = [
     "AddHeader"
 ]
 
+_delete = re.compile("Delete \"\"")
+
 
 class Delete(Action):
 
@@ -37,7 +40,10 @@ class Delete(Action):
         return
 
     def parse(self, data: str) -> bool:
-        return False
+        m = _delete.search(data)
+        if m is None:
+            return False
+        return True
 
     def result(self) -> str:
         text = "Delete mail"
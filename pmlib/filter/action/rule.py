@@ -16,6 +16,8 @@
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
 
+import re
+
 from pmlib.filter.types import Action
 
 __all__ = [
@@ -27,6 +29,13 @@ __all__ = [
     "LogicalAnd"
 ]
 
+_exit = re.compile("Exit \"\"")
+_call = re.compile("Call \"(?P<Label>.+)\"")
+_goto = re.compile("Goto \"(?P<Label>.+)\"")
+_return = re.compile("Return \"\"")
+_skip_next = re.compile("SkipNext \"\"")
+_logical_and = re.compile("LogicalAnd \"\"")
+
 
 class Exit(Action):
 
@@ -37,7 +46,10 @@ class Exit(Action):
         return
 
     def parse(self, data: str) -> bool:
-        return False
+        m = _exit.search(data)
+        if m is None:
+            return False
+        return True
 
     def result(self) -> str:
         text = "Exit rule set"
@@ -54,7 +66,12 @@ class Call(Action):
         return
 
     def parse(self, data: str) -> bool:
-        return False
+        m = _call.search(data)
+        if m is None:
+            return False
+
+        self.parameter = m.group('Label')
+        return True
 
     def result(self) -> str:
         text = "Call label {0:s}".format(self.parameter)
@@ -71,7 +88,12 @@ class Goto(Action):
         return
 
     def parse(self, data: str) -> bool:
-        return False
+        m = _goto.search(data)
+        if m is None:
+            return False
+
+        self.parameter = m.group('Label')
+        return True
 
     def result(self) -> str:
         text = "Goto label {0:s}".format(self.parameter)
@@ -87,7 +109,10 @@ class Return(Action):
         return
 
     def parse(self, data: str) -> bool:
-        return False
+        m = _return.search(data)
+        if m is None:
+            return False
+        return True
 
     def result(self) -> str:
         text = "Return from call"
@@ -103,7 +128,10 @@ class SkipNext(Action):
         return
 
     def parse(self, data: str) -> bool:
-        return False
+        m = _skip_next.search(data)
+        if m is None:
+            return False
+        return True
 
     def result(self) -> str:
         text = "Skip next rule"
@@ -119,7 +147,10 @@ class LogicalAnd(Action):
         return
 
     def parse(self, data: str) -> bool:
-        return False
+        m = _logical_and.search(data)
+        if m is None:
+            return False
+        return True
 
     def result(self) -> str:
         text = "Logical and next rule"
@@ -0,0 +1,389 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import re
+import copy
+import fnmatch
+import email.utils
+
+from array import array
+from collections import deque
+from datetime import datetime, timedelta
+from email.message import Message
+from typing import List, Dict, Set, Tuple, Pattern, Union
+
+from pmlib.filter.types import Rule
+from pmlib.filter.rules.age import Age
+from pmlib.filter.rules.always import Always
+from pmlib.filter.rules.date import Date
+from pmlib.filter.rules.expression import Expression
+from pmlib.filter.rules.header import Header
+from pmlib.filter.rules.size import Size
+
+__all__ = [
+    "Engine",
+    "get_date",
+    "get_headers"
+]
+
+_blank_line = re.compile(b"\n\n|\r\n\r\n")
+
+# actions by their filter name, the action modules import the folder types and can't be imported here
+_stops = ["Exit", "Move", "Delete"]
+_jumps = ["Call", "Goto", "Return"]
+
+
+def _get_timestamp(value: datetime, default: float) -> float:
+    try:
+        timestamp = value.timestamp()
+    except (OverflowError, OSError, ValueError):
+        return default
+    return timestamp
+
+
+def get_headers(value) -> str:
+    # the headers end at the first empty line, works on memoryview slices without a copy of the body
+    m = _blank_line.search(value)
+    if m is not None:
+        value = value[:m.end()]
+    return str(value, "ascii", "surrogateescape")
+
+
+def get_date(message: Message) -> Union[datetime, None]:
+    value = message.get("Date", None)
+    if value is None:
+        return None
+
+    try:
+        date = email.utils.parsedate_to_datetime(str(value))
+        if date.tzinfo is not None:
+            date = date.astimezone().replace(tzinfo=None)
+    except (TypeError, ValueError, IndexError, OverflowError, OSError):
+        return None
+    return date
+
+
+class _Automaton(object):
+
+    # Aho-Corasick automaton, finds all patterns in a text in a single pass
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        return
+
+    def add(self, pattern: str, value: int):
+        state = 0
+
+        for char in pattern:
+            next_state = self._goto[state].get(char, None)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+
+        self._output[state].append(value)
+        return
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+
+        while len(queue) != 0:
+            state = queue.popleft()
+
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while (fail != 0) and (char not in self._goto[fail]):
+                    fail = self._fail[fail]
+
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                self._output[next_state] = self._output[next_state] + self._output[fail]
+        return
+
+    def search(self, text: str, found: Set[int]):
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        found.update(output[0])
+
+        state = 0
+        for char in text:
+            while (state != 0) and (char not in goto[state]):
+                state = fail[state]
+
+            state = goto[state].get(char, 0)
+            if len(output[state]) != 0:
+                found.update(output[state])
+        return
+
+
+class Engine(object):
+
+    def __init__(self, rules: List[Rule], now: Union[datetime, None] = None):
+        self.rules: List[Rule] = rules
+        self.now: datetime = now
+        self.use_body: bool = False
+        self.chains: List[Tuple[List[int], str]] = []
+
+        if self.now is None:
+            self.now = datetime.now()
+
+        self._always: List[int] = []
+        self._contains: Dict[str, _Automaton] = {}
+        self._is: Dict[str, Dict[str, List[int]]] = {}
+        self._expressions: List[Tuple[int, Pattern, bool, bool]] = []
+        self._sizes: List[Tuple[int, str, int]] = []
+        self._dates: List[Tuple[int, datetime, datetime]] = []
+
+        for _number, _rule in enumerate(self.rules):
+            self._compile(_number, _rule)
+
+        self._compile_flow()
+
+        for _automaton in self._contains.values():
+            _automaton.build()
+        return
+
+    def _compile_header(self, number: int, rule: Header):
+        value = rule.filter.casefold()
+
+        for _field in rule.fields:
+            if rule.type == "contains":
+                automaton = self._contains.setdefault(_field, _Automaton())
+                automaton.add(value, number)
+            else:
+                values = self._is.setdefault(_field, {})
+                values.setdefault(value, []).append(number)
+        return
+
+    def _compile(self, number: int, rule: Rule):
+        if rule.action is None:
+            return
+
+        if isinstance(rule, Always):
+            self._always.append(number)
+            return
+
+        if isinstance(rule, Header):
+            self._compile_header(number, rule)
+            return
+
+        if isinstance(rule, Expression):
+            # Pegasus expressions use * and ? wildcards and are tested line by line
+            pattern = re.compile(fnmatch.translate(rule.expression), re.IGNORECASE)
+            headers = rule.type.value in ["headers", "both"]
+            body = rule.type.value in ["body", "both"]
+            if body is True:
+                self.use_body = True
+            self._expressions.append((number, pattern, headers, body))
+            return
+
+        if isinstance(rule, Size):
+            self._sizes.append((number, rule.type, rule.size))
+            return
+
+        if isinstance(rule, Age):
+            if rule.days >= 0:
+                end = self.now - timedelta(days=rule.days)
+            else:
+                end = rule.time
+            if end is not None:
+                self._dates.append((number, datetime.min, end))
+            return
+
+        if isinstance(rule, Date):
+            if rule.is_days is True:
+                start = self.now - timedelta(days=rule.days2)
+                end = self.now - timedelta(days=rule.days1)
+            else:
+                start = rule.time1
+                end = rule.time2
+            if (start is not None) and (end is not None):
+                self._dates.append((number, start, end))
+        return
+
+    def _compile_flow(self):
+        # rules joined by LogicalAnd only act if all of them match, the flow is taken from the last one
+        numbers = []
+
+        for _number, _rule in enumerate(self.rules):
+            action = _rule.action
+            if action is None:
+                continue
+
+            numbers.append(_number)
+            if action.filter == "LogicalAnd":
+                continue
+
+            flow = ""
+            if action.filter in _stops:
+                flow = "stop"
+            if action.filter == "SkipNext":
+                flow = "skip"
+
+            self.chains.append((numbers, flow))
+            numbers = []
+        return
+
+    @property
+    def unsupported(self) -> List[Rule]:
+        # jumps between labels are not followed
+        rules = [_rule for _rule in self.rules if (_rule.action is not None) and (_rule.action.filter in _jumps)]
+        return rules
+
+    def match_headers(self, message: Message, found: Set[int]):
+        for _field, _automaton in self._contains.items():
+            for _value in message.get_all(_field, []):
+                _automaton.search(str(_value).casefold(), found)
+
+        for _field, _values in self._is.items():
+            for _value in message.get_all(_field, []):
+                found.update(_values.get(str(_value).strip().casefold(), []))
+        return
+
+    def match_expressions(self, message: Message, found: Set[int]):
+        if len(self._expressions) == 0:
+            return
+
+        headers = ["{0:s}: {1:s}".format(_key, str(_value)) for _key, _value in message.items()]
+        body = []
+
+        if self.use_body is True:
+            payload = message.get_payload()
+            if isinstance(payload, str):
+                body = payload.splitlines()
+
+        for _number, _pattern, _headers, _body in self._expressions:
+            if (_headers is True) and any(_pattern.match(_line) for _line in headers):
+                found.add(_number)
+                continue
+
+            if (_body is True) and any(_pattern.match(_line) for _line in body):
+                found.add(_number)
+        return
+
+    def match_size(self, size: int, found: Set[int]):
+        for _number, _type, _size in self._sizes:
+            if (_type == ">") and (size > _size):
+                found.add(_number)
+
+            if (_type == "<") and (size < _size):
+                found.add(_number)
+        return
+
+    def match_date(self, date: Union[datetime, None], found: Set[int]):
+        if date is None:
+            return
+
+        for _number, _start, _end in self._dates:
+            if _start <= date <= _end:
+                found.add(_number)
+        return
+
+    @property
+    def is_metadata(self) -> bool:
+        # all rules can be answered from mail size and date alone, header and expression rules need the mail
+        if (len(self._contains) != 0) or (len(self._is) != 0) or (len(self._expressions) != 0):
+            return False
+        return True
+
+    def detach(self):
+        # copy without the rules, their actions reference the whole folder tree
+        engine = copy.copy(self)
+        engine.rules = []
+        return engine
+
+    def match_index(self, lengths: array, dates: array) -> Dict[int, bytes]:
+        # one mask per rule with a byte for every mail, dates are POSIX timestamps with 0 if unknown.
+        # only used by the simulation with an index, rule sets on headers still read the mails.
+        # map with the bound comparison keeps the loop over the mails in C, the masks are combined as integers.
+        count = len(lengths)
+        masks: Dict[int, bytes] = {}
+
+        for _number in self._always:
+            masks[_number] = b"\x01" * count
+
+        for _number, _type, _size in self._sizes:
+            if _type == ">":
+                masks[_number] = bytes(map(_size.__lt__, lengths))
+
+            if _type == "<":
+                masks[_number] = bytes(map(_size.__gt__, lengths))
+
+        if len(self._dates) == 0:
+            return masks
+
+        known = int.from_bytes(bytes(map(bool, dates)), "little")
+
+        for _number, _start, _end in self._dates:
+            start = _get_timestamp(_start, float("-inf"))
+            end = _get_timestamp(_end, float("inf"))
+
+            value = known
+            value &= int.from_bytes(bytes(map(start.__le__, dates)), "little")
+            value &= int.from_bytes(bytes(map(end.__ge__, dates)), "little")
+            masks[_number] = value.to_bytes(count, "little")
+        return masks
+
+    def match_numbers(self, message: Message, size: int) -> List[int]:
+        found: Set[int] = set(self._always)
+
+        self.match_headers(message, found)
+        self.match_expressions(message, found)
+        self.match_size(size, found)
+        self.match_date(get_date(message), found)
+        return sorted(found)
+
+    def walk(self, found: Set[int], reached: Union[List[int], None] = None) -> List[int]:
+        # rules taken in order of the rule set, reached collects the matched rules the processing got to
+        numbers = []
+        skip = False
+
+        for _numbers, _flow in self.chains:
+            if skip is True:
+                skip = False
+                continue
+
+            matched = [_number for _number in _numbers if _number in found]
+            if reached is not None:
+                reached.extend(matched)
+
+            if len(matched) != len(_numbers):
+                continue
+
+            numbers.extend(_numbers)
+
+            if _flow == "skip":
+                skip = True
+
+            if _flow == "stop":
+                break
+        return numbers
+
+    def match(self, message: Message, size: int) -> List[Rule]:
+        found = set(self.match_numbers(message, size))
+        rules = [self.rules[_number] for _number in self.walk(found)]
+        return rules
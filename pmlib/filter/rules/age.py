@@ -35,6 +35,10 @@ __all__ = [
 #  If age absolute older than 011212112233 Move "49ZTFXJP:12B4:FOL069F6"
 #  01 12 12 11 22 33
 
+_pattern1: Pattern = re.compile("If age older than (?P<Days>[0-9]+) (?P<Action>.+)")
+_pattern2: Pattern = re.compile("If age absolute older than (?P<Date>[0-9]+) (?P<Action>.+)")
+_date: Pattern = re.compile("(?P<YY>[0-9][0-9])(?P<MM>[0-9][0-9])(?P<DD>[0-9][0-9])(?P<hh>[0-9][0-9])(?P<mm>[0-9][0-9])(?P<ss>[0-9][0-9])")
+
 
 class Age(Rule):
 
@@ -46,15 +50,7 @@ class Age(Rule):
         return text
 
     def __init__(self):
-        Rule.__init__(self, "Message age...")
-
-        self._pattern1 = re.compile(
-            "If age older than (?P<Days>[0-9]+) (?P<Action>.+)")
-
-        self._pattern2 = re.compile(
-            "If age absolute older than (?P<Date>[0-9]+) (?P<Action>.+)")
-
-        self._date: Pattern = re.compile("(?P<YY>[0-9][0-9])(?P<MM>[0-9][0-9])(?P<DD>[0-9][0-9])(?P<hh>[0-9][0-9])(?P<mm>[0-9][0-9])(?P<ss>[0-9][0-9])")
+        Rule.__init__(self, "Message age...", "If age")
 
         self.days: int = -1
         self.time: Union[None, datetime] = None
@@ -62,17 +58,17 @@ class Age(Rule):
 
     def parse(self, data: str) -> bool:
 
-        m = self._pattern1.search(data)
+        m = _pattern1.search(data)
         if m is not None:
             _action = m.group('Action')
             self.days = int(m.group('Days'))
             self.set_action(m.group('Action'))
             return True
 
-        m = self._pattern2.search(data)
+        m = _pattern2.search(data)
         if m is not None:
 
-            d = self._date.search(m.group('Date'))
+            d = _date.search(m.group('Date'))
             if d is None:
                 return False
 
@@ -18,6 +18,8 @@
 
 import re
 
+from typing import Pattern
+
 from pmlib.filter.types import Rule
 
 __all__ = [
@@ -29,6 +31,8 @@ __all__ = [
 
 # Always MarkRead ""
 
+_pattern: Pattern = re.compile("Always (?P<Action>.+)")
+
 
 class Always(Rule):
 
@@ -37,14 +41,11 @@ class Always(Rule):
         return text
 
     def __init__(self):
-        Rule.__init__(self, "Always")
-
-        self._pattern = re.compile(
-            "Always (?P<Action>.+)")
+        Rule.__init__(self, "Always", "Always")
         return
 
     def parse(self, data: str) -> bool:
-        m = self._pattern.search(data)
+        m = _pattern.search(data)
         if m is None:
             return False
 
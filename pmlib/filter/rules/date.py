@@ -35,6 +35,11 @@ __all__ = [
 #  If date absolute between 280501000000 and 280601000000
 #    Move "BNNW0F27:6321:FOL04467"
 
+_pattern1: Pattern = re.compile("If date between (?P<Days1>[0-9]+) and (?P<Days2>[0-9]+) (?P<Action>.+)")
+_pattern2: Pattern = re.compile("If date absolute between (?P<Date1>[0-9]+) and (?P<Date2>[0-9]+)")
+_pattern_second: Pattern = re.compile(" {3}(?P<Action>.+)")
+_date: Pattern = re.compile("(?P<YY>[0-9][0-9])(?P<MM>[0-9][0-9])(?P<DD>[0-9][0-9])(?P<hh>[0-9][0-9])(?P<mm>[0-9][0-9])(?P<ss>[0-9][0-9])")
+
 
 class Date(Rule):
 
@@ -46,17 +51,7 @@ class Date(Rule):
         return text
 
     def __init__(self):
-        Rule.__init__(self, "Message date...")
-
-        self._pattern1 = re.compile(
-            "If date between (?P<Days1>[0-9]+) and (?P<Days2>[0-9]+) (?P<Action>.+)")
-
-        self._pattern2 = re.compile(
-            "If date absolute between (?P<Date1>[0-9]+) and (?P<Date2>[0-9]+)")
-
-        self._pattern_second: Pattern = re.compile(" {3}(?P<Action>.+)")
-
-        self._date: Pattern = re.compile("(?P<YY>[0-9][0-9])(?P<MM>[0-9][0-9])(?P<DD>[0-9][0-9])(?P<hh>[0-9][0-9])(?P<mm>[0-9][0-9])(?P<ss>[0-9][0-9])")
+        Rule.__init__(self, "Message date...", "If date")
 
         self.is_days: bool = False
 
@@ -68,13 +63,13 @@ class Date(Rule):
 
     def parse(self, data: str) -> bool:
         if self.follow_line is True:
-            m = self._pattern_second.search(data)
+            m = _pattern_second.search(data)
             if m is None:
                 return False
             self.set_action(m.group('Action'))
             return True
 
-        m = self._pattern1.search(data)
+        m = _pattern1.search(data)
         if m is not None:
             self.is_days = True
             self.days1 = int(m.group('Days1'))
@@ -82,13 +77,13 @@ class Date(Rule):
             self.set_action(m.group('Action'))
             return True
 
-        m = self._pattern2.search(data)
+        m = _pattern2.search(data)
         if m is not None:
             self.follow_line = True
             self.is_days = False
 
-            d1 = self._date.search(m.group('Date1'))
-            d2 = self._date.search(m.group('Date2'))
+            d1 = _date.search(m.group('Date1'))
+            d2 = _date.search(m.group('Date2'))
             if (d1 is None) or (d2 is None):
                 return False
 
@@ -19,6 +19,7 @@
 import re
 
 from enum import Enum
+from typing import Pattern
 
 from pmlib.filter.types import Rule
 
@@ -41,6 +42,9 @@ class _ExpressionType(Enum):
 #  If expression body matches "Return-path: <do-not-reply@archiveofourown.org>" Move "MDJIPSSK:0830:FOL00B44"
 #  If expression both matches "Return-path: <do-not-reply@archiveofourown.org>" Move "MDJIPSSK:0830:FOL00B44"
 
+_pattern: Pattern = re.compile(
+    "If expression (?P<Type>headers|body|both) matches \"(?P<Filter>.+)\" (?P<Action>.+)")
+
 
 class Expression(Rule):
 
@@ -49,17 +53,14 @@ class Expression(Rule):
         return text
 
     def __init__(self):
-        Rule.__init__(self, "Expression...")
-
-        self._pattern = re.compile(
-            "If expression (?P<Type>headers|body|both) matches \"(?P<Filter>.+)\" (?P<Action>.+)")
+        Rule.__init__(self, "Expression...", "If expression")
 
         self.expression: str = ""
         self.type: _ExpressionType = _ExpressionType.unknown
         return
 
     def parse(self, data: str) -> bool:
-        m = self._pattern.search(data)
+        m = _pattern.search(data)
         if m is None:
             return False
 
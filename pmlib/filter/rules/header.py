@@ -18,7 +18,7 @@
 
 import re
 
-from typing import List
+from typing import List, Pattern
 from enum import Enum
 
 from pmlib.filter.types import Rule
@@ -37,6 +37,16 @@ class _Condition(Enum):
     ReplyTo = "R"
     Sender = "E"
 
+
+_fields = {
+    _Condition.To: "To",
+    _Condition.From: "From",
+    _Condition.Cc: "Cc",
+    _Condition.Subject: "Subject",
+    _Condition.ReplyTo: "Reply-To",
+    _Condition.Sender: "Sender"
+}
+
 # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
 # Headers...
 
@@ -52,6 +62,9 @@ class _Condition(Enum):
 #  contains
 #  is
 
+_pattern: Pattern = re.compile(
+    "If header \"(?P<Header>[TFCSRE]+)\" (?P<Type>contains|is) \"(?P<Filter>.+)\" (?P<Action>.+)")
+
 
 class Header(Rule):
 
@@ -60,17 +73,20 @@ class Header(Rule):
         return text
 
     def __init__(self):
-        Rule.__init__(self, "Headers")
-        self._pattern = re.compile(
-            "If header \"(?P<Header>[TFCSRE]+)\" (?P<Type>contains|is) \"(?P<Filter>.+)\" (?P<Action>.+)")
+        Rule.__init__(self, "Headers", "If header")
 
         self.header: List[_Condition] = []
         self.type: str = ""
         self.filter: str = ""
         return
 
+    @property
+    def fields(self) -> List[str]:
+        fields = [_fields[_condition] for _condition in self.header]
+        return fields
+
     def parse(self, data: str) -> bool:
-        m = self._pattern.search(data)
+        m = _pattern.search(data)
         if m is None:
             return False
 
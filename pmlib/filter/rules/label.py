@@ -31,7 +31,7 @@ __all__ = [
 class Label(Rule):
 
     def __init__(self):
-        Rule.__init__(self, "Label")
+        Rule.__init__(self, "Label", "Label")
         self.condition = False
         return
 
@@ -18,6 +18,8 @@
 
 import re
 
+from typing import Pattern
+
 from pmlib.filter.types import Rule
 
 __all__ = [
@@ -30,6 +32,8 @@ __all__ = [
 #  If size > 50000 Move "BNNW0F27:6321:FOL04467"
 #  If size < 50000 Move "BNNW0F27:6321:FOL04467"
 
+_pattern: Pattern = re.compile("If size (?P<Type>[<>]) (?P<Size>[0-9]+) (?P<Action>.+)")
+
 
 class Size(Rule):
 
@@ -38,10 +42,7 @@ class Size(Rule):
         return text
 
     def __init__(self):
-        Rule.__init__(self, "Message size...")
-
-        self._pattern = re.compile(
-            "If size (?P<Type>[<>]) (?P<Size>[0-9]+) (?P<Action>.+)")
+        Rule.__init__(self, "Message size...", "If size")
 
         self.type: str = ""
         self.size: int = 0
@@ -49,7 +50,7 @@ class Size(Rule):
 
     def parse(self, data: str) -> bool:
 
-        m = self._pattern.search(data)
+        m = _pattern.search(data)
         if m is None:
             return False
 
@@ -17,15 +17,17 @@
 #
 import abc
 
+from dataclasses import dataclass
 from typing import Union
 from abc import ABCMeta
 
-from typing import List
+from typing import List, Dict
 
 from bbutil.utils import get_attribute
 
 __all__ = [
     "Action",
+    "RuleReport",
     "Rule"
 ]
 
@@ -53,7 +55,7 @@ class Action(metaclass=ABCMeta):
 class _Actions(object):
 
     def __init__(self):
-        self.modules: list = []
+        self.modules: Dict[str, type] = {}
 
         import pmlib.filter.action
 
@@ -67,32 +69,65 @@ class _Actions(object):
 
         for _item in input_list:
             attr = get_attribute(path, _item)
-            self.modules.append(attr)
+            action: Action = attr()
+            self.modules[action.filter] = attr
         return
 
+    def get(self, data: str) -> Union[type, None]:
+        keyword = data.lstrip().split(" ", 1)[0]
+        attr = self.modules.get(keyword, None)
+        return attr
+
+
+_actions: Union[_Actions, None] = None
+
+
+def _get_actions() -> _Actions:
+    global _actions
+
+    if _actions is None:
+        _actions = _Actions()
+    return _actions
+
+
+@dataclass(init=True)
+class RuleReport(object):
+
+    hits: int = 0
+    first: int = 0
+    reached: int = 0
+    status: str = ""
+
+    def __repr__(self):
+        if self.status == "":
+            return "{0:d}/{1:d}".format(self.hits, self.first)
+        return "{0:d}/{1:d} {2:s}".format(self.hits, self.first, self.status)
+
 
 class Rule(metaclass=ABCMeta):
 
     def __repr__(self):
         return self.name
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, keyword: str):
         self.follow_line: bool = False
         self.name: str = name
+        self.keyword: str = keyword
         self.filename: str = ""
         self.action: Union[Action, None] = None
+        self.report: RuleReport = RuleReport()
         return
 
     def set_action(self, data: str) -> Union[Action, None]:
-        actions = _Actions()
-
-        for attr in actions.modules:
-            _item = attr()
-            _item.rule = self
-            check = _item.parse(data)
-            if check is True:
-                self.action = _item
-                return
+        attr = _get_actions().get(data)
+        if attr is None:
+            return
+
+        _item = attr()
+        _item.rule = self
+        check = _item.parse(data)
+        if check is True:
+            self.action = _item
         return
 
     @abc.abstractmethod
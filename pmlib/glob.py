@@ -16,10 +16,12 @@
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Dict
 
 from pmlib.item import Item
 from pmlib.filter import Filter
+from pmlib.types import Phase
+from pmlib.utils import Timer
 
 __all__ = [
     "Data"
@@ -31,5 +33,13 @@ class Data(object):
 
     level: int = 0
     entries: List[Item] = field(default_factory=list)
+    index: Dict[str, Item] = field(default_factory=dict)
+    tree: Dict[str, List[Item]] = field(default_factory=dict)
     root: Item = field(default=None)
     filter: Filter = field(default_factory=Filter)
+    phases: List[Phase] = field(default_factory=list)
+
+    def add_phase(self, name: str, timer: Timer):
+        wall, cpu = timer.stop()
+        self.phases.append(Phase(name=name, wall=wall, cpu=cpu))
+        return
@@ -53,6 +53,8 @@ class Hierarchy(object):
                 data.is_root = True
                 pmlib.data.root = data
             pmlib.data.entries.append(data)
+            pmlib.data.index.setdefault(data.id, data)
+            pmlib.data.tree.setdefault(data.parent_id, []).append(data)
         f.close()
 
         count = len(pmlib.data.entries)
@@ -104,15 +106,10 @@ class Hierarchy(object):
         max_count = len(item.children)
         counter = Counter()
 
-        for _item in sorted(item.children, key=sort_items):
-            if _item.type is Entry.folder:
-                self._count_item(item.navigation.level, counter, _item, max_count)
-                self._index(_item)
-
-        for _item in sorted(item.children, key=sort_items):
-            if _item.type is Entry.tray:
-                self._count_item(item.navigation.level, counter, _item, max_count)
-                self._index(_item)
+        # children are already sorted by populate: first folder, then trays
+        for _item in item.children:
+            self._count_item(item.navigation.level, counter, _item, max_count)
+            self._index(_item)
         return
 
     def _prune(self, item: Item):
@@ -138,10 +135,10 @@ class Hierarchy(object):
 
         root.navigation.level = 0
         root.navigation.is_last = True
-        root.populate(pmlib.data.entries)
+        root.populate(pmlib.data.tree)
 
         for _item in pmlib.data.entries:
-            _item.populate(pmlib.data.entries)
+            _item.populate(pmlib.data.tree)
 
         self._prune(root)
 
@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import abc
+import struct
+
+from abc import ABCMeta
+from array import array
+from datetime import datetime
+from typing import Union, Tuple
+
+import pmlib
+
+__all__ = [
+    "IndexPMG",
+    "pack_record"
+]
+
+# =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
+# PMG: index for Unix folders (.MBX)
+
+#  PMI indexes of Pegasus folders (.PMM) are not read, their layout is unknown and the uint32 offsets below
+#  could not address folders over 4 GB. PMM folders are always scanned for their 1A separators.
+#
+#  ASSUMED layout, not verified against index files written by Pegasus Mail. The only files it was tested
+#  with come from pmlib.benchmark.generator, which uses pack_record below. So the index is only read with
+#  --experimental-index, every index is checked against its folder, and a folder is scanned if it does not match.
+#
+#  fixed size records, one per mail, little endian
+#
+#  0   uint32  flags
+#  4   uint32  offset of the mail in the folder file
+#  8   uint32  size of the mail, with the From_ line, without the empty line before the next From_ line
+#  12  uint8   year - 1900
+#  13  uint8   month
+#  14  uint8   day
+#  15  uint8   hour
+#  16  uint8   minute
+#  17  uint8   second
+#  18  ...     from, subject and reserved data up to the record size
+
+_record = struct.Struct("<III6B")
+_record_size = 224
+_gaps = [b"\n", b"\r\n"]
+
+
+def pack_record(flags: int, offset: int, size: int, date: datetime) -> bytes:
+    data = _record.pack(flags, offset, size, date.year - 1900, date.month, date.day,
+                        date.hour, date.minute, date.second)
+    return data.ljust(_record_size, b"\x00")
+
+
+class _Index(metaclass=ABCMeta):
+
+    def __init__(self, filename: str):
+        self.filename: str = filename
+        self.flags: array = array("L")
+        self.offsets: array = array("Q")
+        self.sizes: array = array("Q")
+        self.dates: array = array("q")  # POSIX timestamps, 0 if unknown
+        self.lengths: array = array("Q")  # mail sizes as the filter rules see them, set by check
+        return
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def ends(self) -> array:
+        ends = array("Q", (_offset + _size for _offset, _size in zip(self.offsets, self.sizes)))
+        return ends
+
+    def positions(self, start: int = 0, base: int = 0) -> Tuple[array, array]:
+        starts = array("Q")
+        ends = array("Q")
+
+        for _offset, _size in zip(self.offsets, self.sizes):
+            if _offset < start:
+                continue
+            starts.append(_offset - base)
+            ends.append(_offset + _size - base)
+        return starts, ends
+
+    def date(self, number: int) -> Union[datetime, None]:
+        value = self.dates[number]
+        if value == 0:
+            return None
+        return datetime.fromtimestamp(value)
+
+    @staticmethod
+    def _get_date(year: int, month: int, day: int, hour: int, minute: int, second: int) -> int:
+        try:
+            value = datetime(1900 + year, month, day, hour, minute, second)
+        except ValueError:
+            return 0
+        return int(value.timestamp())
+
+    def parse(self) -> bool:
+        if os.path.exists(self.filename) is False:
+            pmlib.log.error("Index not found: {0:s}".format(self.filename))
+            return False
+
+        try:
+            f = open(self.filename, mode="rb")
+        except OSError as e:
+            pmlib.log.exception(e)
+            return False
+
+        data = f.read(-1)
+        f.close()
+
+        if len(data) % _record_size != 0:
+            pmlib.log.warn(os.path.basename(self.filename), "Index has an unknown record size!")
+            return False
+
+        for _pos in range(0, len(data), _record_size):
+            flags, offset, size, year, month, day, hour, minute, second = _record.unpack_from(data, _pos)
+
+            self.flags.append(flags)
+            self.offsets.append(offset)
+            self.sizes.append(size)
+            self.dates.append(self._get_date(year, month, day, hour, minute, second))
+        return True
+
+    @abc.abstractmethod
+    def check(self, f, start: int) -> bool:
+        pass
+
+
+class IndexPMG(_Index):
+
+    def check(self, f, start: int) -> bool:
+        size = os.fstat(f.fileno()).st_size
+        last = start
+        lengths = array("Q")
+
+        # offsets are uint32, so larger folders can not be covered
+        if size > 0xFFFFFFFF:
+            return False
+
+        for _offset, _size in zip(self.offsets, self.sizes):
+            end = _offset + _size
+            if (_offset < last) or (end > size):
+                return False
+
+            # mails follow each other, only the empty line between two mails may lie between the records.
+            # Anything else is a mail the index does not know about.
+            if _offset != last:
+                if _offset - last > 2:
+                    return False
+
+                f.seek(last)
+                if f.read(_offset - last) not in _gaps:
+                    return False
+
+            f.seek(_offset)
+            line = f.readline(_size)
+            if line.startswith(b"From ") is False:
+                return False
+
+            # the source gives the rules the mail without its From_ line
+            lengths.append(_size - len(line))
+            last = end
+
+        # the index has to cover the whole folder, Pegasus appends mails before it writes the index.
+        # Only the empty line after the last mail may follow, the record size leaves it out.
+        f.seek(last)
+        if f.read(3) not in [b""] + _gaps:
+            return False
+
+        self.lengths = lengths
+        return True
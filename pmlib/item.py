@@ -18,7 +18,8 @@
 
 import os
 import re
-from typing import List, Union
+import copy
+from typing import List, Union, Dict
 
 import pmlib
 
@@ -130,19 +131,19 @@ class Item(EntryData):
         self.valid = True
         return
 
-    def populate(self, datalist: List[EntryData]):
+    def populate(self, tree: Dict[str, List[EntryData]]):
         if self.is_sorted is True:
             return
 
-        children = []
+        children = tree.get(self.id, [])
 
-        for _item in datalist:
-            if _item.parent_id == self.id:
-                children.append(_item)
-                _item.parent = self
+        for _item in children:
+            _item.parent = self
+            _item.target = ""
+            _item.full_name = ""
 
-                if _item.type is Entry.folder:
-                    _item.is_sorted = True
+            if _item.type is Entry.folder:
+                _item.is_sorted = True
 
         if (self.type is Entry.tray) and (len(children) == 0):
             self.valid = False
@@ -160,36 +161,21 @@ class Item(EntryData):
         self.is_sorted = True
         return
 
-    def _set_target(self, target: str, path: str, item: EntryData) -> str:
-        if path == "":
-            ret = target
-        else:
-            ret = path
+    def _set_path(self):
+        parent = self.parent
 
-        if item.parent is None:
-            ret = "{0:s}/{1:s}".format(ret, item.name)
+        if parent is None:
+            path = "{0:s}/{1:s}".format(pmlib.config.target_path, self.name)
+            self.full_name = self.name
         else:
-            _data = self._set_target(target, ret, item.parent)
-            ret = "{0:s}/{1:s}".format(_data, item.name)
+            if parent.target == "":
+                parent._set_path()
 
-        result = os.path.abspath(os.path.normpath(ret))
-        return result
+            path = "{0:s}/{1:s}".format(parent.target, self.name)
+            self.full_name = "{0:s}\\{1:s}".format(parent.full_name, self.name)
 
-    def _set_full_name(self, path: str, item: EntryData) -> str:
-        ret = ""
-        if path != "":
-            ret = path
-
-        if item.parent is None:
-            if ret == "":
-                ret = "{0:s}".format(item.name)
-            else:
-                ret = "{0:s}\\{1:s}".format(ret, item.name)
-        else:
-            _data = self._set_full_name(ret, item.parent)
-            ret = "{0:s}\\{1:s}".format(_data, item.name)
-
-        return ret
+        self.target = os.path.abspath(os.path.normpath(path))
+        return
 
     def add_error(self, number: int, text: str, exception: Exception):
         error = ErrorReport()
@@ -200,10 +186,26 @@ class Item(EntryData):
         return
 
     def set_target(self):
-        self.target = self._set_target(pmlib.config.target_path, "", self)
-        self.full_name = self._set_full_name("", self)
+        self._set_path()
+
+        # parents are always set before their children
+        for _item in self.children:
+            _item.set_target()
         return
 
+    def detach(self) -> EntryData:
+        item = copy.copy(self)
+        item.children = []
+        item.rules = []
+
+        if self.parent is not None:
+            parent = copy.copy(self.parent)
+            parent.parent = None
+            parent.children = []
+            parent.rules = []
+            item.parent = parent
+        return item
+
     def _search(self, item: EntryData, name: str) -> Union[EntryData, None]:
 
         for _item in item.children:
@@ -216,11 +218,26 @@ class Item(EntryData):
 
         return None
 
+    def is_parent(self, item: EntryData) -> bool:
+        while item is not None:
+            if item is self:
+                return True
+            item = item.parent
+        return False
+
     def search(self, name: str) -> Union[EntryData, None]:
 
         if self.id == name:
             return self
 
+        item = pmlib.data.index.get(name, None)
+        if item is None:
+            return None
+
+        if (item.valid is True) and (self.is_parent(item) is True):
+            return item
+
+        # the id is used more than once, the first entry is not below this item
         ret = self._search(self, name)
         return ret
 
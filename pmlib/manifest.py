@@ -0,0 +1,252 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import json
+import time
+import hashlib
+
+from dataclasses import dataclass, asdict
+from typing import Dict, Union
+
+import pmlib
+
+from pmlib.item import Item
+from pmlib.types import Target
+
+__all__ = [
+    "Manifest",
+    "ManifestEntry",
+    "reset_target"
+]
+
+_version = 1
+_chunk = 65536
+_interval = 1.0
+
+
+def reset_target(path: str):
+    if os.path.isfile(path):
+        os.remove(path)
+        return
+
+    for _name in ["new", "cur", "tmp"]:
+        folder = os.path.join(path, _name)
+        if os.path.isdir(folder) is False:
+            continue
+
+        for _entry in os.scandir(folder):
+            if _entry.is_file():
+                os.remove(_entry.path)
+    return
+
+
+@dataclass(init=True)
+class ManifestEntry(object):
+
+    filename: str = ""
+    size: int = 0
+    mtime: float = 0.0
+    fingerprint: str = ""
+    target: str = ""
+    written: int = 0
+    offset: int = 0
+    count: int = 0
+    success: int = 0
+    failure: int = 0
+    complete: bool = False
+
+    def same(self, state) -> bool:
+        if (self.filename != state.filename) or (self.size != state.size) or (self.mtime != state.mtime):
+            return False
+
+        if self.fingerprint != state.fingerprint:
+            return False
+        return True
+
+
+class Manifest(object):
+
+    def __init__(self, path: str, target: Target):
+        self.filename: str = os.path.join(path, "manifest.json")
+        self.target: Target = target
+        self.folders: Dict[str, ManifestEntry] = {}
+        self._written: float = 0.0
+        self._changed: bool = False
+        return
+
+    @staticmethod
+    def get_state(filename: str, size: int = -1) -> Union[ManifestEntry, None]:
+        try:
+            stat = os.stat(filename)
+            f = open(filename, mode="rb")
+        except OSError as e:
+            pmlib.log.exception(e)
+            return None
+
+        # a given size hashes only the start of the file, to check if a grown file kept its old data
+        mtime = 0.0
+        if size == -1:
+            size = stat.st_size
+            mtime = stat.st_mtime
+
+        # size, mtime and both ends of the file, reading the whole folder would cost as much as converting it
+        value = hashlib.blake2b(digest_size=16)
+        value.update(f.read(min(size, _chunk)))
+
+        if size > _chunk:
+            tail = max(size - _chunk, _chunk)
+            f.seek(tail)
+            value.update(f.read(size - tail))
+
+        f.close()
+
+        state = ManifestEntry(filename=os.path.abspath(filename),
+                              size=size,
+                              mtime=mtime,
+                              fingerprint=value.hexdigest())
+        return state
+
+    def load(self) -> bool:
+        if os.path.exists(self.filename) is False:
+            return True
+
+        try:
+            f = open(self.filename, mode="r", encoding="utf-8")
+            data = json.load(f)
+            f.close()
+        except (OSError, ValueError) as e:
+            pmlib.log.exception(e)
+            return False
+
+        if (data.get("version", 0) != _version) or (data.get("target", "") != self.target.name):
+            pmlib.log.warn("Manifest", "Manifest does not match target, convert all folders!")
+            return True
+
+        for _id, _value in data.get("folders", {}).items():
+            self.folders[_id] = ManifestEntry(**_value)
+
+        pmlib.log.inform("Manifest", "{0:d} folders found".format(len(self.folders)))
+        return True
+
+    def write(self, force: bool = False) -> bool:
+        if self._changed is False:
+            return True
+
+        # writing is rate limited, a crash loses at most the last second of work
+        now = time.monotonic()
+        if (force is False) and ((now - self._written) < _interval):
+            return True
+
+        data = {
+            "version": _version,
+            "target": self.target.name,
+            "folders": {_id: asdict(_entry) for _id, _entry in self.folders.items()}
+        }
+
+        temp = "{0:s}.tmp".format(self.filename)
+
+        try:
+            f = open(temp, mode="w", encoding="utf-8")
+            json.dump(data, f, indent=1)
+            f.close()
+            os.replace(temp, self.filename)
+        except OSError as e:
+            pmlib.log.exception(e)
+            return False
+
+        self._written = now
+        self._changed = False
+        return True
+
+    def is_complete(self, item: Item, path: str) -> bool:
+        entry = self.folders.get(item.id, None)
+        if entry is None:
+            return False
+
+        if (entry.complete is False) or (entry.target != path) or (os.path.exists(path) is False):
+            return False
+        return True
+
+    def is_done(self, item: Item, state: ManifestEntry, path: str) -> bool:
+        if (state is None) or (self.is_complete(item, path) is False):
+            return False
+
+        entry = self.folders[item.id]
+        return entry.same(state)
+
+    def get_offset(self, item: Item, state: ManifestEntry, path: str) -> int:
+        if (state is None) or (self.is_complete(item, path) is False):
+            return 0
+
+        entry = self.folders[item.id]
+        if (entry.filename != state.filename) or (state.size <= entry.size) or (entry.offset == 0):
+            return 0
+
+        # only appended to, if the old part of the file is unchanged
+        value = self.get_state(state.filename, entry.size)
+        if (value is None) or (value.fingerprint != entry.fingerprint):
+            return 0
+        return entry.offset
+
+    def set_done(self, item: Item, state: ManifestEntry, path: str):
+        if state is None:
+            return
+
+        entry = ManifestEntry(**asdict(state))
+        entry.target = path
+        entry.written = item.report.bytes_written
+        entry.offset = item.report.offset
+        entry.count = item.report.count
+        entry.success = item.report.success
+        entry.failure = item.report.failure
+        entry.complete = True
+
+        # delta runs only convert the new mails
+        if item.offset != 0:
+            previous = self.folders[item.id]
+            entry.written += previous.written
+            entry.count += previous.count
+            entry.success += previous.success
+            entry.failure += previous.failure
+
+        self.folders[item.id] = entry
+        self._changed = True
+        self.write()
+        return
+
+    def reset(self, folder: str):
+        entry = self.folders.get(folder, None)
+        if (entry is None) or (entry.complete is False):
+            return
+
+        # converted again with the next run that looks at it
+        entry.complete = False
+        self._changed = True
+        return
+
+    def restore(self, item: Item):
+        entry = self.folders[item.id]
+
+        item.report.count = entry.count
+        item.report.success = entry.success
+        item.report.failure = entry.failure
+        item.report.bytes_written = entry.written
+        item.mail_count = entry.count
+        item.size = entry.size
+        return
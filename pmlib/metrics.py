@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import sys
+import json
+import time
+
+from dataclasses import dataclass, field, asdict
+from typing import List, Tuple
+
+import pmlib
+
+from pmlib.types import Entry, Phase
+from pmlib.utils import create_folder
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+__all__ = [
+    "Metrics"
+]
+
+_prefix = "pmconvert"
+
+
+def _get_rss(who: int) -> int:
+    if resource is None:
+        return 0
+
+    value = resource.getrusage(who).ru_maxrss
+
+    # kilobytes everywhere but on macOS
+    if sys.platform != "darwin":
+        value *= 1024
+    return value
+
+
+def _add(lines: List[str], name: str, kind: str, text: str, values: List[Tuple[str, float]]):
+    metric = "{0:s}_{1:s}".format(_prefix, name)
+    lines.append("# HELP {0:s} {1:s}".format(metric, text))
+    lines.append("# TYPE {0:s} {1:s}".format(metric, kind))
+    for _labels, _value in values:
+        lines.append("{0:s}{1:s} {2:s}".format(metric, _labels, repr(_value)))
+    return
+
+
+@dataclass(init=True)
+class _Folder(object):
+
+    name: str = ""
+    messages: int = 0
+    success: int = 0
+    failures: int = 0
+    routed: int = 0
+    routed_in: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+@dataclass(init=True)
+class Metrics(object):
+
+    timestamp: float = 0.0
+    result: bool = True
+    messages: int = 0
+    success: int = 0
+    failures: int = 0
+    routed: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    throughput: float = 0.0
+    peak_rss: int = 0
+    peak_rss_workers: int = 0
+    phases: List[Phase] = field(default_factory=list)
+    folders: List[_Folder] = field(default_factory=list)
+
+    def collect(self, result: bool):
+        self.timestamp = time.time()
+        self.result = result
+
+        for _item in pmlib.data.entries:
+            if (_item.type is not Entry.folder) or (_item.valid is False):
+                continue
+
+            report = _item.report
+            folder = _Folder(name=_item.full_name,
+                             messages=report.count,
+                             success=report.success,
+                             failures=report.failure,
+                             routed=report.routed,
+                             routed_in=report.routed_in,
+                             bytes_read=report.bytes_read,
+                             bytes_written=report.bytes_written,
+                             wall=report.wall,
+                             cpu=report.cpu)
+            self.folders.append(folder)
+
+            self.messages += report.count
+            self.success += report.success
+            self.failures += report.failure
+            self.routed += report.routed
+            self.bytes_read += report.bytes_read
+            self.bytes_written += report.bytes_written
+
+        self.phases = list(pmlib.data.phases)
+
+        for _phase in self.phases:
+            if (_phase.name == "convert") and (_phase.wall != 0.0):
+                self.throughput = self.messages / _phase.wall
+
+        if resource is not None:
+            self.peak_rss = _get_rss(resource.RUSAGE_SELF)
+            self.peak_rss_workers = _get_rss(resource.RUSAGE_CHILDREN)
+        return
+
+    def _create_prometheus(self) -> List[str]:
+        lines = []
+
+        _add(lines, "last_run_timestamp_seconds", "gauge", "Time the run finished.", [("", self.timestamp)])
+        _add(lines, "last_run_success", "gauge", "1 if the run finished without errors, 0 if it failed.",
+             [("", float(self.result))])
+        # per folder values stay in the JSON file, a series per folder has no bound on its labels
+        _add(lines, "folders", "gauge", "Folders read.", [("", len(self.folders))])
+        _add(lines, "messages", "gauge", "Mails read, converted or not.", [("", self.messages)])
+        _add(lines, "success", "gauge", "Mails converted.", [("", self.success)])
+        _add(lines, "failures", "gauge", "Mails that could not be converted.", [("", self.failures)])
+        _add(lines, "routed", "gauge", "Mails moved to other folders by filter rules.", [("", self.routed)])
+        _add(lines, "read_bytes", "gauge", "Mail bytes read from the Pegasus folders.", [("", self.bytes_read)])
+        _add(lines, "written_bytes", "gauge", "Bytes written to the target folders.", [("", self.bytes_written)])
+        _add(lines, "throughput_messages_per_second", "gauge", "Mails per second in the convert phase.",
+             [("", self.throughput)])
+        _add(lines, "peak_rss_bytes", "gauge", "Peak resident set size.",
+             [("{process=\"main\"}", self.peak_rss), ("{process=\"workers\"}", self.peak_rss_workers)])
+
+        _add(lines, "phase_duration_seconds", "gauge", "Wall time per phase.",
+             [("{{phase=\"{0:s}\"}}".format(_phase.name), _phase.wall) for _phase in self.phases])
+        _add(lines, "phase_cpu_seconds", "gauge", "CPU time per phase.",
+             [("{{phase=\"{0:s}\"}}".format(_phase.name), _phase.cpu) for _phase in self.phases])
+
+        return lines
+
+    @staticmethod
+    def _write(filename: str, value: str) -> bool:
+        # write to a temporary file first, so a scraper never sees a partial file
+        temp = "{0:s}.tmp".format(filename)
+
+        try:
+            f = open(temp, mode="w", encoding="utf-8")
+            f.write(value)
+            f.close()
+            os.replace(temp, filename)
+        except OSError as e:
+            pmlib.log.exception(e)
+            return False
+
+        pmlib.log.inform("Metrics", filename)
+        return True
+
+    def write(self, path: str) -> bool:
+        check = create_folder(path)
+        if check is False:
+            return False
+
+        value = "\n".join(self._create_prometheus()) + "\n"
+
+        check = self._write(os.path.join(path, "{0:s}.prom".format(_prefix)), value)
+        if check is False:
+            return False
+
+        value = json.dumps(asdict(self), indent=2)
+
+        check = self._write(os.path.join(path, "{0:s}.json".format(_prefix)), value)
+        return check
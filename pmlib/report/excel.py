@@ -20,10 +20,16 @@ import os
 import xlsxwriter
 import xlsxwriter.exceptions
 
+from datetime import datetime
+from typing import Dict, List
+
+from xlsxwriter.format import Format
+from xlsxwriter.worksheet import Worksheet
+
 import pmlib
 from pmlib.report import Reporter, Symbol
 from pmlib.item import Item, sort_items
-from pmlib.types import Entry
+from pmlib.types import Entry, MailStatus
 
 report = "ReportExcel"
 
@@ -31,6 +37,8 @@ __all__ = [
     "ReportExcel"
 ]
 
+_max_rows = 1048576
+
 
 class ReportExcel(Reporter):
 
@@ -43,12 +51,21 @@ class ReportExcel(Reporter):
         self.workbook: xlsxwriter.Workbook = None
         self.sheet: xlsxwriter.workbook.Worksheet = None
         self.row: int = 0
+        self.formats: Dict[str, Format] = {}
 
         self.column_tree: int = 0
         self.column_count: int = 1
         self.column_success: int = 2
         self.column_failure: int = 3
-        self.column_filter: int = 4
+        self.column_wall: int = 4
+        self.column_cpu: int = 5
+        self.column_read: int = 6
+        self.column_written: int = 7
+        self.column_speed: int = 8
+        self.column_filter: int = 9
+        self.column_hits: int = 10
+        self.column_routed: int = 10  # routing and simulation exclude each other
+        self.column_routed_in: int = 11
         return
 
     def format_symbol(self, symbol: Symbol, item: Item) -> str:
@@ -90,27 +107,82 @@ class ReportExcel(Reporter):
 
         return ""
 
-    def _create_header(self):
-        cell_format = self.workbook.add_format()
-        cell_format.set_bottom(5)
-        cell_format.set_font_name("Arial")
-        cell_format.set_font_size(10)
-        cell_format.set_bold()
+    def _create_formats(self):
+        header = self.workbook.add_format()
+        header.set_bottom(5)
+        header.set_font_name("Arial")
+        header.set_font_size(10)
+        header.set_bold()
+
+        tree = self.workbook.add_format()
+        tree.set_font_name("Lucida Console")
+        tree.set_font_size(8)
+        tree.set_align("left")
+        tree.set_align("vcenter")
+
+        cell = self.workbook.add_format()
+        cell.set_font_name("Arial")
+        cell.set_font_size(8)
+        cell.set_align("left")
+        cell.set_align("vcenter")
+
+        cell_filter = self.workbook.add_format()
+        cell_filter.set_font_name("Arial")
+        cell_filter.set_font_size(8)
+        cell_filter.set_align("left")
+        cell_filter.set_align("vcenter")
+        cell_filter.set_text_wrap()
+
+        date = self.workbook.add_format()
+        date.set_font_name("Arial")
+        date.set_font_size(8)
+        date.set_align("left")
+        date.set_align("vcenter")
+        date.set_num_format("yyyy-mm-dd hh:mm:ss")
+
+        self.formats = {
+            "header": header,
+            "tree": tree,
+            "cell": cell,
+            "filter": cell_filter,
+            "date": date
+        }
+        return
+
+    def _create_sheet(self, name: str, columns: List[str], width: int) -> Worksheet:
+        sheet = self.workbook.add_worksheet(name)
+
+        n = 0
+        for _column in columns:
+            sheet.write_string(0, n, _column, self.formats["header"])
+            n += 1
 
+        sheet.freeze_panes(1, 0)
+        sheet.set_column(0, 0, width)
+        return sheet
+
+    def _create_header(self):
         _columns = [
             "Name",
             "C",
             "+",
             "-",
+            "Time",
+            "CPU",
+            "Read",
+            "Written",
+            "Mails/s",
             "Filter"
         ]
 
-        n = 0
-        for _column in _columns:
-            self.sheet.write_string(self.row, n, _column, cell_format)
-            n += 1
+        if pmlib.config.simulate is True:
+            _columns.append("Hits")
 
-        self.sheet.freeze_panes(1, 0)
+        if pmlib.config.route is True:
+            _columns.append("Routed out")
+            _columns.append("Routed in")
+
+        self.sheet = self._create_sheet("Report", _columns, 50)
         self.row += 1
         return
 
@@ -126,28 +198,106 @@ class ReportExcel(Reporter):
                 _filter = line
             else:
                 _filter = "{0:s}\n{1:s}".format(_filter, line)
+            n += 1
 
         return _filter
 
-    def _write_item(self, item: Item):
-        cell_tree = self.workbook.add_format()
-        cell_tree.set_font_name("Lucida Console")
-        cell_tree.set_font_size(8)
-        cell_tree.set_align("left")
-        cell_tree.set_align("vcenter")
-
-        cell_format = self.workbook.add_format()
-        cell_format.set_font_name("Arial")
-        cell_format.set_font_size(8)
-        cell_format.set_align("left")
-        cell_format.set_align("vcenter")
+    @staticmethod
+    def _create_hits(item: Item) -> str:
+        _hits = "\n".join([repr(_rule.report) for _rule in item.rules])
+        return _hits
 
-        cell_filter = self.workbook.add_format()
-        cell_filter.set_font_name("Arial")
-        cell_filter.set_font_size(8)
-        cell_filter.set_align("left")
-        cell_filter.set_align("vcenter")
-        cell_filter.set_text_wrap()
+    def _create_phases(self):
+        _columns = [
+            "Phase",
+            "Time",
+            "CPU"
+        ]
+
+        sheet = self._create_sheet("Phases", _columns, 20)
+        cell_format = self.formats["cell"]
+
+        row = 1
+        for _phase in pmlib.data.phases:
+            sheet.write_string(row, 0, _phase.name, cell_format)
+            sheet.write_number(row, 1, _phase.wall, cell_format)
+            sheet.write_number(row, 2, _phase.cpu, cell_format)
+            row += 1
+        return
+
+    def _create_rules(self):
+        _columns = [
+            "Rule",
+            "Hits",
+            "First",
+            "Reached",
+            "Status"
+        ]
+
+        sheet = self._create_sheet("Filter", _columns, 80)
+        cell_format = self.formats["cell"]
+
+        row = 1
+        for _rule in pmlib.data.filter.rules:
+            sheet.write_string(row, 0, str(_rule), cell_format)
+            sheet.write_number(row, 1, _rule.report.hits, cell_format)
+            sheet.write_number(row, 2, _rule.report.first, cell_format)
+            sheet.write_number(row, 3, _rule.report.reached, cell_format)
+            sheet.write_string(row, 4, _rule.report.status, cell_format)
+            row += 1
+        return
+
+    def _create_mails(self):
+        _columns = [
+            "Folder",
+            "Index",
+            "Size",
+            "Date",
+            "Status"
+        ]
+
+        cell_format = self.formats["cell"]
+        date_format = self.formats["date"]
+        status = [_status.name for _status in MailStatus]
+
+        sheet = None
+        number = 0
+        row = _max_rows
+
+        for _item in pmlib.data.entries:
+            if _item.type is not Entry.folder:
+                continue
+
+            report = _item.report
+
+            for _mail in range(len(report.mail_sizes)):
+                # constant memory mode: rows are flushed as soon as the next row starts
+                if row == _max_rows:
+                    number += 1
+                    name = "Mails"
+                    if number > 1:
+                        name = "Mails {0:d}".format(number)
+
+                    sheet = self._create_sheet(name, _columns, 50)
+                    sheet.set_column(3, 3, 18)
+                    row = 1
+
+                sheet.write_string(row, 0, _item.full_name, cell_format)
+                sheet.write_number(row, 1, _mail, cell_format)
+                sheet.write_number(row, 2, report.mail_sizes[_mail], cell_format)
+
+                date = report.mail_dates[_mail]
+                if date != 0:
+                    sheet.write_datetime(row, 3, datetime.fromtimestamp(date), date_format)
+
+                sheet.write_string(row, 4, status[report.mail_status[_mail]], cell_format)
+                row += 1
+        return
+
+    def _write_item(self, item: Item):
+        cell_tree = self.formats["tree"]
+        cell_format = self.formats["cell"]
+        cell_filter = self.formats["filter"]
 
         text = ""
         for _symbol in item.symbols:
@@ -162,7 +312,19 @@ class ReportExcel(Reporter):
         self.sheet.write_number(self.row, self.column_count, item.report.count, cell_format)
         self.sheet.write_number(self.row, self.column_success, item.report.success, cell_format)
         self.sheet.write_number(self.row, self.column_failure, item.report.failure, cell_format)
+        self.sheet.write_number(self.row, self.column_wall, item.report.wall, cell_format)
+        self.sheet.write_number(self.row, self.column_cpu, item.report.cpu, cell_format)
+        self.sheet.write_number(self.row, self.column_read, item.report.bytes_read, cell_format)
+        self.sheet.write_number(self.row, self.column_written, item.report.bytes_written, cell_format)
+        self.sheet.write_number(self.row, self.column_speed, item.report.messages_per_second, cell_format)
         self.sheet.write_string(self.row, self.column_filter, self._create_filter(item), cell_filter)
+
+        if pmlib.config.simulate is True:
+            self.sheet.write_string(self.row, self.column_hits, self._create_hits(item), cell_filter)
+
+        if pmlib.config.route is True:
+            self.sheet.write_number(self.row, self.column_routed, item.report.routed, cell_format)
+            self.sheet.write_number(self.row, self.column_routed_in, item.report.routed_in, cell_format)
         self.row += 1
         return
 
@@ -182,14 +344,20 @@ class ReportExcel(Reporter):
     def create(self) -> bool:
         filename = os.path.abspath(os.path.normpath("{0:s}/report.xlsx".format(pmlib.config.target_path)))
         self.workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
-        self.sheet = self.workbook.add_worksheet("Report")
 
         pmlib.log.inform(self.name, filename)
 
+        self._create_formats()
         self._create_header()
         self._create_item(pmlib.data.root)
 
-        self.sheet.set_column(0, 0, 50)
+        self._create_phases()
+
+        if pmlib.config.simulate is True:
+            self._create_rules()
+
+        if pmlib.config.details is True:
+            self._create_mails()
 
         pmlib.log.inform(self.name, "Write number of rows {0:d}".format(self.row))
         try:
@@ -17,14 +17,15 @@
 #
 
 import os
-from typing import List
+from typing import Union, TextIO
 
 import pmlib
 
-from yattag import Doc, indent
+from yattag import Doc
 from pmlib.item import Item, sort_items
 
 from pmlib.types import Entry
+from pmlib.utils import convert_bytes
 from pmlib.report import Reporter, Symbol
 
 report = "ReportHTML"
@@ -86,8 +87,7 @@ class ReportHTML(Reporter):
         Reporter.__init__(self)
         self.name = "HTML"
         self.desc = "Create HTML report"
-        self.tuple: tuple = Doc().ttl()
-        self.entries: List[Item] = []
+        self.file: Union[TextIO, None] = None
         return
 
     def format_symbol(self, symbol: Symbol, item: Item) -> str:
@@ -129,10 +129,15 @@ class ReportHTML(Reporter):
 
         return "&#8200;"
 
-    def _create_head(self, head):
-        doc, tag, text, line = self.tuple
+    def _write(self, doc: Doc):
+        self.file.write(doc.getvalue())
+        self.file.write("\n")
+        return
+
+    def _create_head(self):
+        doc, tag, text, line = Doc().ttl()
 
-        with head:
+        with tag("head"):
             with tag("title"):
                 text("pmconvert: Pegasus Mail Converter: {0:s}".format(self.root.name))
 
@@ -140,37 +145,108 @@ class ReportHTML(Reporter):
             with tag("style"):
                 text(_style)
 
+        self._write(doc)
         return
 
-    def _create_body(self, body):
-        doc, tag, text, line = self.tuple
+    def _create_body(self):
+        doc, tag, text, line = Doc().ttl()
+
+        with tag("h2"):
+            text("Mailbox Folder Report")
+
+        self._write(doc)
+        self._create_table()
 
-        with body:
-            with tag("h2"):
-                text("Mailbox Folder Report")
+        self._create_phases()
 
-            table = tag("table", id="")
-            self._create_table(table)
+        if pmlib.config.simulate is True:
+            self._create_rules()
         return
 
-    def _create_table(self, table):
-        doc, tag, text, line = self.tuple
-        with table:
+    def _create_phases(self):
+        doc, tag, text, line = Doc().ttl()
+
+        with tag("h2"):
+            text("Phases")
+
+        with tag("table", id=""):
             with tag("tr"):
-                max_len = len(pmlib.data.root.symbols)
-                with tag("th", colspan=max_len, klass="heading"):
-                    doc.asis(self.get_symbol(Symbol.space))
-
-                line("th", "Count", klass="heading")
-                line("th", "Success", klass="heading")
-                line("th", "Failure", klass="heading")
-                line("th", "Filter", klass="heading")
-
-            for _item in self.entries:
-                if _item.valid is False:
-                    continue
-                tr = tag("tr")
-                self._create_item(tr, _item)
+                line("th", "Phase", klass="heading")
+                line("th", "Time", klass="heading")
+                line("th", "CPU", klass="heading")
+
+            for _phase in pmlib.data.phases:
+                with tag("tr"):
+                    line("td", _phase.name)
+                    line("td", "{0:.3f}s".format(_phase.wall))
+                    line("td", "{0:.3f}s".format(_phase.cpu))
+
+        self._write(doc)
+        return
+
+    def _create_rules(self):
+        doc, tag, text, line = Doc().ttl()
+
+        with tag("h2"):
+            text("Filter Simulation")
+
+        self.file.write("{0:s}\n<table id=\"\">\n".format(doc.getvalue()))
+
+        doc, tag, text, line = Doc().ttl()
+        with tag("tr"):
+            line("th", "Rule", klass="heading")
+            line("th", "Hits", klass="heading")
+            line("th", "First", klass="heading")
+            line("th", "Reached", klass="heading")
+            line("th", "Status", klass="heading")
+        self._write(doc)
+
+        for _rule in pmlib.data.filter.rules:
+            doc, tag, text, line = Doc().ttl()
+            with tag("tr"):
+                line("td", str(_rule))
+                line("td", "{0:d}".format(_rule.report.hits))
+                line("td", "{0:d}".format(_rule.report.first))
+                line("td", "{0:d}".format(_rule.report.reached))
+                line("td", _rule.report.status)
+            self._write(doc)
+
+        self.file.write("</table>\n")
+        return
+
+    def _create_table(self):
+        doc, tag, text, line = Doc().ttl()
+
+        self.file.write("<table id=\"\">\n")
+
+        with tag("tr"):
+            max_len = pmlib.data.level + 2
+            with tag("th", colspan=max_len, klass="heading"):
+                doc.asis(self.get_symbol(Symbol.space))
+
+            line("th", "Count", klass="heading")
+            line("th", "Success", klass="heading")
+            line("th", "Failure", klass="heading")
+            line("th", "Time", klass="heading")
+            line("th", "CPU", klass="heading")
+            line("th", "Read", klass="heading")
+            line("th", "Written", klass="heading")
+            line("th", "Mails/s", klass="heading")
+            line("th", "Filter", klass="heading")
+
+            if pmlib.config.simulate is True:
+                line("th", "Hits", klass="heading")
+
+            if pmlib.config.route is True:
+                line("th", "Routed out", klass="heading")
+                line("th", "Routed in", klass="heading")
+
+        self._write(doc)
+
+        self._create_item(pmlib.data.root)
+        self._sort_entries(pmlib.data.root)
+
+        self.file.write("</table>\n")
         return
 
     @staticmethod
@@ -185,12 +261,28 @@ class ReportHTML(Reporter):
                 _filter = line
             else:
                 _filter = "{0:s}\n{1:s}".format(_filter, line)
+            n += 1
 
         return _filter
 
-    def _create_item(self, tr, item: Item):
-        doc, tag, text, line = self.tuple
-        with tr:
+    @staticmethod
+    def _create_hits(item: Item) -> str:
+        _hits = "\n".join([repr(_rule.report) for _rule in item.rules])
+        return _hits
+
+    def _create_item(self, item: Item):
+        if item.valid is False:
+            return
+
+        symbols = []
+        for _ in range(pmlib.data.level + 2):
+            symbols.append("")
+
+        item.symbols = symbols
+        self.set_symbol(item)
+
+        doc, tag, text, line = Doc().ttl()
+        with tag("tr"):
             max_len = len(item.symbols)
 
             for i in range(max_len - 1, -1, -1):
@@ -202,11 +294,18 @@ class ReportHTML(Reporter):
 
             colspan = max_len - len(item.symbols) + 1
 
+            columns = 9
+            if pmlib.config.simulate is True:
+                columns += 1
+
+            if pmlib.config.route is True:
+                columns += 2
+
             if item.type is Entry.tray:
-                colspan += 4
+                colspan += columns
 
             if item.type is Entry.mailbox:
-                colspan += 4
+                colspan += columns
 
             last = len(item.symbols) - 1
             n = 0
@@ -223,61 +322,56 @@ class ReportHTML(Reporter):
                 line("td", "{0:d}".format(item.report.count))
                 line("td", "{0:d}".format(item.report.success))
                 line("td", "{0:d}".format(item.report.failure))
+                line("td", "{0:.3f}s".format(item.report.wall))
+                line("td", "{0:.3f}s".format(item.report.cpu))
+                line("td", convert_bytes(item.report.bytes_read))
+                line("td", convert_bytes(item.report.bytes_written))
+                line("td", "{0:.1f}".format(item.report.messages_per_second))
                 line("td", self._create_filter(item))
+
+                if pmlib.config.simulate is True:
+                    line("td", self._create_hits(item))
+
+                if pmlib.config.route is True:
+                    line("td", "{0:d}".format(item.report.routed))
+                    line("td", "{0:d}".format(item.report.routed_in))
+
+        self._write(doc)
         return
 
     def _sort_entries(self, item: Item):
+        # rows are written while walking the tree, so the report is never kept in memory
 
         for _items in sorted(item.children, key=sort_items):
             if _items.type is Entry.folder:
-                self.entries.append(_items)
+                self._create_item(_items)
 
         for _items in sorted(item.children, key=sort_items):
             if _items.type is Entry.tray:
-                self.entries.append(_items)
+                self._create_item(_items)
                 self._sort_entries(_items)
         return
 
     def create(self) -> bool:
-        for _item in pmlib.data.entries:
-            symbols = []
-            for _ in range(pmlib.data.level + 2):
-                symbols.append("")
-
-            _item.symbols = symbols
-
-        for _item in pmlib.data.entries:
-            self.set_symbol(_item)
-
-        self.entries.append(pmlib.data.root)
-        self._sort_entries(pmlib.data.root)
-
         filename = os.path.abspath(os.path.normpath("{0:s}/report.html".format(pmlib.config.target_path)))
         pmlib.log.inform(self.name, filename)
 
-        doc, tag, text, line = self.tuple
-        doc.asis('<!DOCTYPE html>')
-        html = tag("html")
-
-        with html:
-            head = tag("head")
-            self._create_head(head)
-
-            body = tag("body")
-            self._create_body(body)
-
-        result = indent(
-            doc.getvalue(),
-            indentation='  ',
-            newline='\n',
-            indent_text=False
-        )
+        try:
+            self.file = open(filename, "w", encoding="utf-8")
+        except OSError as e:
+            pmlib.log.exception(e)
+            return False
 
         try:
-            f = open(filename, "w", encoding="utf-8")
-            f.write(result)
-            f.close()
+            self.file.write("<!DOCTYPE html>\n<html>\n")
+            self._create_head()
+            self.file.write("<body>\n")
+            self._create_body()
+            self.file.write("</body>\n</html>\n")
         except OSError as e:
             pmlib.log.exception(e)
+            self.file.close()
             return False
+
+        self.file.close()
         return True
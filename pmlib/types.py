@@ -16,6 +16,7 @@
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
 
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Match, Union, List, Any
@@ -28,12 +29,14 @@ __all__ = [
     "Target",
     "Object",
     "Folder",
+    "MailStatus",
     "EntryReport",
     "ErrorReport",
     "Navigation",
     "Counter",
     "EntryData",
-    "Position"
+    "Position",
+    "Phase"
 ]
 
 
@@ -116,6 +119,13 @@ class ErrorReport(object):
         return self.text
 
 
+class MailStatus(Enum):
+
+    success = 0
+    failure = 1
+    routed = 2
+
+
 @dataclass(init=True)
 class EntryReport(object):
 
@@ -125,10 +135,34 @@ class EntryReport(object):
     count: int = 0
     success: int = 0
     failure: int = 0
+    routed: int = 0
+    routed_in: int = 0
+    duplicates: int = 0
+    linked: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    offset: int = 0  # source position after the last converted mail
+    mail_sizes: array = field(default_factory=lambda: array("Q"))
+    mail_dates: array = field(default_factory=lambda: array("q"))  # POSIX timestamps, 0 if unknown
+    mail_status: bytearray = field(default_factory=bytearray)
 
     def __repr__(self):
         return self.filename
 
+    def add_mail(self, size: int, date: int, status: MailStatus):
+        self.mail_sizes.append(size)
+        self.mail_dates.append(date)
+        self.mail_status.append(status.value)
+        return
+
+    @property
+    def messages_per_second(self) -> float:
+        if self.wall == 0.0:
+            return 0.0
+        return self.count / self.wall
+
 
 @dataclass(init=False)
 class Navigation(object):
@@ -157,6 +191,7 @@ class EntryData(object):
     data: Union[Object, Folder] = None
     size: int = 0
     mail_count: int = 0
+    offset: int = 0  # source position to start converting, for delta runs
     children: List[Any] = field(default_factory=list)
     rules: List[Rule] = field(default_factory=list)
     target: str = ""
@@ -185,3 +220,11 @@ class Position(object):
     @property
     def length(self) -> int:
         return self.end - self.start
+
+
+@dataclass(init=True)
+class Phase(object):
+
+    name: str = ""
+    wall: float = 0.0
+    cpu: float = 0.0
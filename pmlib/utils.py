@@ -17,8 +17,12 @@
 #
 
 import os
+import re
+import time
 import shutil
-from typing import Union
+
+from array import array
+from typing import Union, Tuple, Iterator
 
 import pmlib
 
@@ -28,9 +32,19 @@ __all__ = [
     "create_folder",
     "clean_folder",
     "convert_bytes",
-    "get_entry_type"
+    "get_entry_type",
+    "find_separators",
+    "get_positions",
+    "iter_messages",
+    "read_positions",
+    "escape_from",
+    "get_size",
+    "Timer",
+    "FolderProgress"
 ]
 
+_from = re.compile(b"^(>*From )", re.MULTILINE)
+
 
 def create_folder(folder: str) -> bool:
     if os.path.exists(folder) is False:
@@ -74,3 +88,121 @@ def get_entry_type(value: int) -> Union[Entry, None]:
             _ret = _item
             break
     return _ret
+
+
+def find_separators(stream, separator: int = 0x1a, start: int = 0, end: int = -1) -> array:
+    offsets = array("Q")
+    value = bytes([separator])
+
+    if end == -1:
+        end = len(stream)
+
+    find = stream.find
+    pos = find(value, start, end)
+    while pos != -1:
+        offsets.append(pos)
+        pos = find(value, pos + 1, end)
+    return offsets
+
+
+def get_positions(stream, separator: int = 0x1a, start: int = 0) -> Tuple[array, array]:
+    ends = find_separators(stream, separator, start)
+    starts = array("Q", [start])
+    starts.extend(_pos + 1 for _pos in ends)
+    starts.pop()
+    return starts, ends
+
+
+def iter_messages(f, block_size: int, separator: int = 0x1a) -> Iterator[bytes]:
+    value = bytes([separator])
+    parts = []  # message data carried over from the previous blocks
+
+    block = f.read(block_size)
+    while block:
+        start = 0
+        pos = block.find(value)
+
+        while pos != -1:
+            if len(parts) == 0:
+                yield block[start:pos]
+            else:
+                parts.append(block[start:pos])
+                yield b"".join(parts)
+                parts = []
+
+            start = pos + 1
+            pos = block.find(value, start)
+
+        if start < len(block):
+            parts.append(block[start:])
+
+        block = f.read(block_size)
+    return
+
+
+def read_positions(f, starts: array, ends: array) -> Iterator[bytes]:
+    for _start, _end in zip(starts, ends):
+        f.seek(_start)
+        yield f.read(_end - _start)
+    return
+
+
+def escape_from(value: bytes) -> bytes:
+    return _from.sub(b">\\1", value)  # mboxrd
+
+
+def get_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    size = 0
+
+    # maildir folder, subfolders are own folders
+    for _name in ["new", "cur"]:
+        folder = os.path.join(path, _name)
+        if os.path.isdir(folder) is False:
+            continue
+
+        for _entry in os.scandir(folder):
+            if _entry.is_file():
+                size += _entry.stat().st_size
+    return size
+
+
+class Timer(object):
+
+    def __init__(self):
+        self.wall: float = time.perf_counter()
+        self.cpu: float = time.process_time()
+        return
+
+    def stop(self) -> Tuple[float, float]:
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        return wall, cpu
+
+
+class FolderProgress(object):
+
+    # parallel workers share the console, so only the main process draws progress bars
+
+    def __init__(self, limit: int):
+        self.progress = None
+        if pmlib.config.progress is True:
+            self.progress = pmlib.log.progress(limit)
+        return
+
+    def inc(self):
+        if self.progress is not None:
+            self.progress.inc()
+        return
+
+    def set(self, value: int):
+        if self.progress is not None:
+            self.progress.set(value)
+        return
+
+    def close(self):
+        if self.progress is not None:
+            pmlib.log.clear()
+        return
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import time
+
+from typing import Dict, Set, Tuple, Union
+
+import pmlib
+
+from pmlib.types import Entry
+
+__all__ = [
+    "Watcher"
+]
+
+_hierarchy = "HIERARCH.PM"
+
+_extensions = [
+    ".PMM",
+    ".PMI",
+    ".MBX",
+    ".PMG"
+]
+
+
+class Watcher(object):
+
+    def __init__(self, path: str, interval: int):
+        self.path: str = path
+        self.interval: int = interval
+        self.done: Dict[str, Tuple[int, int]] = {}  # state of the last conversion
+        self.last: Dict[str, Tuple[int, int]] = {}  # state of the last poll
+        return
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+
+        try:
+            entries = os.scandir(self.path)
+        except OSError as e:
+            pmlib.log.exception(e)
+            return snapshot
+
+        for _entry in entries:
+            name = _entry.name.upper()
+            if (name != _hierarchy) and (os.path.splitext(name)[1] not in _extensions):
+                continue
+
+            try:
+                stat = _entry.stat()
+            except OSError:
+                continue  # removed while scanning
+            snapshot[name] = (stat.st_size, stat.st_mtime_ns)
+
+        entries.close()
+        return snapshot
+
+    def start(self):
+        self.done = self._snapshot()
+        self.last = self.done
+        return
+
+    def _get_ready(self) -> Set[str]:
+        current = self._snapshot()
+
+        ready = set()
+        for _name in set(current) | set(self.done):
+            value = current.get(_name, None)
+            if value == self.done.get(_name, None):
+                continue
+
+            # wait until Pegasus stopped writing, the file has to be unchanged for one interval
+            if value == self.last.get(_name, None):
+                ready.add(_name)
+
+        self.last = current
+        return ready
+
+    def wait(self) -> Union[Set[str], None]:
+        ready = set()
+
+        try:
+            while len(ready) == 0:
+                time.sleep(self.interval)
+                ready = self._get_ready()
+        except KeyboardInterrupt:
+            return None
+        return ready
+
+    def commit(self, names: Set[str]):
+        for _name in names:
+            value = self.last.get(_name, None)
+            if value is None:
+                self.done.pop(_name, None)
+            else:
+                self.done[_name] = value
+        return
+
+    @staticmethod
+    def get_folders(names: Set[str]) -> Union[Set[str], None]:
+        if _hierarchy in names:
+            return None
+
+        folders = set()
+        for _item in pmlib.data.entries:
+            if _item.type is not Entry.folder:
+                continue
+
+            filename = os.path.basename(_item.data.filename).upper()
+            indexname = os.path.basename(_item.data.indexname).upper()
+            if (filename in names) or (indexname in names):
+                folders.add(_item.id)
+        return folders
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import tempfile
+import unittest
+
+from pmlib.dedup import Dedup
+
+
+class TestDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.dedup = Dedup(self.folder.name)
+        self.assertTrue(self.dedup.open(False))
+
+        self.first = Dedup.get_hash(b"Subject: 1\r\n\r\nbody\r\n")
+        self.second = Dedup.get_hash(b"Subject: 2\n\nbody\n")
+        return
+
+    def tearDown(self):
+        self.dedup.close()
+        self.folder.cleanup()
+        return
+
+    def test_hash(self):
+        self.assertEqual(self.first, Dedup.get_hash(b"Subject: 1\n\nbody\n\n"))
+        self.assertEqual(self.first, Dedup.get_hash(memoryview(b"Subject: 1\n\nbody")))
+        self.assertNotEqual(self.first, self.second)
+        return
+
+    def test_find(self):
+        self.dedup.add(self.first, "F1", "/target/1")
+
+        self.assertEqual(self.dedup.find(self.first), "/target/1")
+        self.assertIsNone(self.dedup.find(self.second))
+        return
+
+    def test_remove(self):
+        self.dedup.add(self.first, "F1", "/target/1")
+        self.dedup.add(self.second, "F2", "/target/2")
+        self.dedup.skip(self.first, "F2")
+        self.dedup.skip(self.first, "F3")
+        self.dedup.skip(self.second, "F1")
+
+        # F2 and F3 skipped the mail of F1, they have to be converted again
+        self.assertEqual(sorted(self.dedup.remove("F1")), ["F2", "F3"])
+        self.assertIsNone(self.dedup.find(self.first))
+        self.assertEqual(self.dedup.find(self.second), "/target/2")
+        self.assertEqual(self.dedup.count, 1)
+
+        self.assertEqual(self.dedup.remove("F1"), [])
+        return
+
+    def test_remove_own(self):
+        # a mail twice in the same folder needs no other folder
+        self.dedup.add(self.first, "F1", "/target/1")
+        self.dedup.skip(self.first, "F1")
+
+        self.assertEqual(self.dedup.remove("F1"), [])
+        return
+
+    def test_keep(self):
+        self.dedup.add(self.first, "F1", "/target/1")
+        self.dedup.close()
+
+        self.dedup = Dedup(self.folder.name)
+        self.assertTrue(self.dedup.open(True))
+        self.assertEqual(self.dedup.find(self.first), "/target/1")
+        self.dedup.close()
+
+        self.dedup = Dedup(self.folder.name)
+        self.assertTrue(self.dedup.open(False))
+        self.assertIsNone(self.dedup.find(self.first))
+        return
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import tempfile
+import unittest
+
+from types import SimpleNamespace
+
+from pmlib.manifest import Manifest
+from pmlib.types import EntryReport, Target
+
+
+def _get_item(offset: int, count: int, written: int, end: int) -> SimpleNamespace:
+    report = EntryReport(count=count, success=count, bytes_written=written, offset=end)
+    item = SimpleNamespace(id="F0000001", offset=offset, report=report)
+    return item
+
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.folder.name, "FOL00001.MBX")
+        self.target = os.path.join(self.folder.name, "Folder 1")
+
+        self._write(b"From a\n\nbody\n", "wb")
+        self._write(b"", "wb", self.target)
+
+        self.manifest = Manifest(self.folder.name, Target.mbox)
+        return
+
+    def tearDown(self):
+        self.folder.cleanup()
+        return
+
+    def _write(self, value: bytes, mode: str, filename: str = ""):
+        if filename == "":
+            filename = self.source
+
+        f = open(filename, mode=mode)
+        f.write(value)
+        f.close()
+        return
+
+    def _set_done(self, item: SimpleNamespace):
+        state = self.manifest.get_state(self.source)
+        self.manifest.set_done(item, state, self.target)
+        return
+
+    def test_delta(self):
+        self._set_done(_get_item(0, 1, 20, 13))
+        self._write(b"From b\n\nbody\n", "ab")
+
+        state = self.manifest.get_state(self.source)
+        item = _get_item(0, 0, 0, 0)
+        self.assertEqual(self.manifest.get_offset(item, state, self.target), 13)
+
+        # counts of a delta run are added to the ones before
+        self._set_done(_get_item(13, 1, 30, 26))
+        self._write(b"From c\n\nbody\n", "ab")
+        self._set_done(_get_item(26, 1, 40, 39))
+
+        entry = self.manifest.folders["F0000001"]
+        self.assertEqual((entry.count, entry.success, entry.written, entry.offset), (3, 3, 90, 39))
+        return
+
+    def test_delta_changed(self):
+        self._set_done(_get_item(0, 1, 20, 13))
+        self._write(b"From x\n\nbody\nFrom b\n\nbody\n", "wb")
+
+        # the old mails changed, so the folder is converted again
+        state = self.manifest.get_state(self.source)
+        item = _get_item(0, 0, 0, 0)
+        self.assertEqual(self.manifest.get_offset(item, state, self.target), 0)
+        return
+
+    def test_delta_target(self):
+        self._set_done(_get_item(0, 1, 20, 13))
+        self._write(b"From b\n\nbody\n", "ab")
+
+        state = self.manifest.get_state(self.source)
+        item = _get_item(0, 0, 0, 0)
+        self.assertEqual(self.manifest.get_offset(item, state, self.target + "2"), 0)
+
+        os.remove(self.target)
+        self.assertEqual(self.manifest.get_offset(item, state, self.target), 0)
+        return
+
+    def test_delta_unchanged(self):
+        self._set_done(_get_item(0, 1, 20, 13))
+
+        state = self.manifest.get_state(self.source)
+        item = _get_item(0, 0, 0, 0)
+        self.assertEqual(self.manifest.get_offset(item, state, self.target), 0)
+        self.assertTrue(self.manifest.is_done(item, state, self.target))
+        return
+
+    def test_resume(self):
+        self._set_done(_get_item(0, 1, 20, 13))
+        self.manifest.write(True)
+
+        manifest = Manifest(self.folder.name, Target.mbox)
+        self.assertTrue(manifest.load())
+
+        state = manifest.get_state(self.source)
+        item = _get_item(0, 0, 0, 0)
+        self.assertTrue(manifest.is_done(item, state, self.target))
+
+        manifest.restore(item)
+        self.assertEqual((item.report.count, item.report.bytes_written), (1, 20))
+
+        # a folder reset by dedup is converted again
+        manifest.reset("F0000001")
+        self.assertFalse(manifest.is_done(item, state, self.target))
+        return
+
+    def test_resume_changed(self):
+        self._set_done(_get_item(0, 1, 20, 13))
+        self._write(b"From x\n\nbody\n", "wb")
+        os.utime(self.source, (0, 0))
+
+        state = self.manifest.get_state(self.source)
+        item = _get_item(0, 0, 0, 0)
+        self.assertFalse(self.manifest.is_done(item, state, self.target))
+        return
+
+    def test_other_target(self):
+        self._set_done(_get_item(0, 1, 20, 13))
+        self.manifest.write(True)
+
+        manifest = Manifest(self.folder.name, Target.maildir)
+        self.assertTrue(manifest.load())
+        self.assertEqual(manifest.folders, {})
+        return
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import io
+import os
+import unittest
+
+from pmlib.convert.source.mbx import _iter_messages
+
+_linesep = os.linesep.encode("ascii")
+
+
+def _get_lines(*lines: bytes) -> bytes:
+    return b"".join(_line + _linesep for _line in lines)
+
+
+class TestIterMessages(unittest.TestCase):
+
+    def test_split(self):
+        data = _get_lines(b"From a", b"Subject: 1", b"", b"body", b"", b"From b", b"Subject: 2", b"", b"body")
+        messages = list(_iter_messages(io.BytesIO(data)))
+
+        self.assertEqual(messages, [_get_lines(b"From a", b"Subject: 1", b"", b"body"),
+                                    _get_lines(b"From b", b"Subject: 2", b"", b"body")])
+        return
+
+    def test_escaped(self):
+        data = _get_lines(b"From a", b"", b">From here", b"Mail From there")
+        messages = list(_iter_messages(io.BytesIO(data)))
+
+        self.assertEqual(messages, [data])
+        return
+
+    def test_offset(self):
+        # delta runs start at the end of the last mail
+        first = _get_lines(b"From a", b"", b"body", b"")
+        second = _get_lines(b"From b", b"", b"body")
+
+        f = io.BytesIO(first + second)
+        f.seek(len(first))
+        messages = list(_iter_messages(f))
+
+        self.assertEqual(messages, [second])
+        self.assertEqual(f.tell(), len(first + second))
+        return
+
+    def test_garbage(self):
+        # lines before the first From_ line belong to no mail
+        data = _get_lines(b"", b"From a", b"body")
+        messages = list(_iter_messages(io.BytesIO(data)))
+
+        self.assertEqual(messages, [_get_lines(b"From a", b"body")])
+        self.assertEqual(list(_iter_messages(io.BytesIO(b""))), [])
+        return
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import copy
+import time
+import tempfile
+import unittest
+
+from typing import Tuple
+
+import pmlib
+
+from pmlib.conf import Config
+from pmlib.convert.target.maildir import TargetMaildir
+from pmlib.convert.target.mbx import TargetMBOX
+from pmlib.types import EntryReport
+
+_count = 8
+
+
+class _Item(object):
+
+    def __init__(self, name: str):
+        self.id: str = name
+        self.name: str = name
+        self.size: int = 0
+        self.report: EntryReport = EntryReport()
+        return
+
+    def detach(self):
+        item = copy.copy(self)
+        item.report = EntryReport()
+        return item
+
+
+def _convert_folder(config: Config, item: _Item, path: str) -> Tuple[bool, _Item]:
+    # runs in the worker process
+    if item.name == "fail":
+        raise OSError("Unable to read folder")
+
+    time.sleep(0.1)
+
+    f = open(path, mode="w")
+    f.close()
+
+    item.size = 10
+    item.report.count = 1
+    return config.progress is False, item
+
+
+class _Mixin(object):
+
+    def _get_target(self):
+        pass
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.config = pmlib.config
+
+        pmlib.config = Config()
+        pmlib.config.jobs = 1
+        pmlib.config.progress = True
+
+        self.target = self._get_target()
+        self.target._skip_folder = self._skip_folder
+        self.target._set_done = self._set_done
+
+        self.done = []
+        self.skip = []
+        return
+
+    def tearDown(self):
+        pmlib.config = self.config
+        self.folder.cleanup()
+        return
+
+    def _skip_folder(self, item: _Item, path: str) -> bool:
+        return item.name in self.skip
+
+    def _set_done(self, item: _Item, path: str):
+        self.done.append(item.name)
+        return
+
+    def _get_folders(self, *names: str) -> list:
+        folders = [(_Item(_name), os.path.join(self.folder.name, _name)) for _name in names]
+        return folders
+
+    def _get_written(self) -> list:
+        return sorted(os.listdir(self.folder.name))
+
+    def test_run(self):
+        names = ["folder{0:d}".format(_number) for _number in range(_count)]
+        folders = self._get_folders(*names)
+        self.skip = ["folder3"]
+
+        check = self.target._run_parallel(_convert_folder, folders)
+
+        names.remove("folder3")
+        self.assertTrue(check)
+        self.assertEqual(sorted(self.done), names)
+        self.assertEqual(self._get_written(), names)
+
+        # the results of the workers replace the items of this process
+        for _item, _ in folders:
+            if _item.name == "folder3":
+                self.assertEqual(_item.report.count, 0)
+            else:
+                self.assertEqual((_item.size, _item.report.count), (10, 1))
+        return
+
+    def test_cancel(self):
+        names = ["folder{0:d}".format(_number) for _number in range(_count)]
+        folders = self._get_folders("fail", *names)
+
+        check = self.target._run_parallel(_convert_folder, folders)
+
+        # a worker may already have taken the next folders, the others are never started
+        self.assertFalse(check)
+        self.assertNotIn("fail", self.done)
+        self.assertLess(len(self._get_written()), _count)
+        self.assertEqual(sorted(self.done), self._get_written())
+        return
+
+
+class TestParallelMBOX(_Mixin, unittest.TestCase):
+
+    def _get_target(self):
+        return TargetMBOX()
+
+
+class TestParallelMaildir(_Mixin, unittest.TestCase):
+
+    def _get_target(self):
+        return TargetMaildir()
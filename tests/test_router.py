@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+
+from types import SimpleNamespace
+
+from pmlib.convert.router import Router
+from pmlib.filter.action.folder import Copy, Move
+from pmlib.filter.engine import Engine, get_headers
+from pmlib.filter.rules.size import Size
+from pmlib.types import Entry
+
+_mail = b"From: a@example.com\r\nSubject: test\r\n\r\nFrom: b@example.com\n\nbody\n"
+
+
+def _get_rule(line: str) -> Size:
+    rule = Size()
+    rule.parse(line)
+    return rule
+
+
+def _get_folder(name: str) -> SimpleNamespace:
+    folder = SimpleNamespace(name=name, type=Entry.folder, report=SimpleNamespace(routed_in=0))
+    return folder
+
+
+def _get_move(folder: SimpleNamespace, action_type: type = Move) -> Size:
+    rule = _get_rule("If size > 0 Exit \"\"")
+    rule.action = action_type()
+    rule.action.rule = rule
+    rule.action.folder = folder
+    return rule
+
+
+class _Target(object):
+
+    @staticmethod
+    def get_box(folder: SimpleNamespace) -> str:
+        return folder.name
+
+
+class TestEngine(unittest.TestCase):
+
+    def test_headers(self):
+        self.assertEqual(get_headers(_mail), "From: a@example.com\r\nSubject: test\r\n\r\n")
+        self.assertEqual(get_headers(memoryview(_mail)), "From: a@example.com\r\nSubject: test\r\n\r\n")
+        self.assertEqual(get_headers(b"Subject: test\n"), "Subject: test\n")
+        return
+
+    def test_exit(self):
+        rules = [
+            _get_rule("If size > 10 Copy \"\""),
+            _get_rule("If size > 10 Exit \"\""),
+            _get_rule("If size > 10 Delete \"\"")
+        ]
+        engine = Engine(rules)
+
+        self.assertIsNone(rules[0].action)
+        self.assertEqual(engine.walk({1, 2}), [1])
+        self.assertEqual(engine.walk({2}), [2])
+        return
+
+    def test_logical_and(self):
+        rules = [
+            _get_rule("If size > 10 LogicalAnd \"\""),
+            _get_rule("If size < 20 Exit \"\""),
+            _get_rule("If size > 10 Delete \"\"")
+        ]
+        engine = Engine(rules)
+
+        self.assertEqual(engine.walk({0, 1, 2}), [0, 1])
+        self.assertEqual(engine.walk({0, 2}), [2])
+        self.assertEqual(engine.walk({1, 2}), [2])
+
+        reached = []
+        engine.walk({0, 2}, reached)
+        self.assertEqual(reached, [0, 2])
+        return
+
+    def test_skip_next(self):
+        rules = [
+            _get_rule("If size > 10 SkipNext \"\""),
+            _get_rule("If size > 10 Exit \"\""),
+            _get_rule("If size > 10 Delete \"\"")
+        ]
+        engine = Engine(rules)
+
+        self.assertEqual(engine.walk({0, 1, 2}), [0, 2])
+        self.assertEqual(engine.walk({1, 2}), [1])
+        return
+
+    def test_unsupported(self):
+        rules = [
+            _get_rule("If size > 10 Goto \"LABEL\""),
+            _get_rule("If size > 10 Call \"LABEL\""),
+            _get_rule("If size > 10 Return \"\""),
+            _get_rule("If size > 10 Exit \"\"")
+        ]
+        engine = Engine(rules)
+
+        self.assertEqual(engine.unsupported, rules[:3])
+        self.assertEqual(rules[0].action.parameter, "LABEL")
+        return
+
+
+class TestRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.item = _get_folder("item")
+        self.copy = _get_folder("copy")
+        self.move = _get_folder("move")
+        return
+
+    def _get_boxes(self, rules: list) -> list:
+        router = Router(Engine(rules), _Target())
+        boxes = router.get_boxes(self.item, "item", _mail)
+        return boxes
+
+    def test_copy_move(self):
+        boxes = self._get_boxes([_get_move(self.copy, Copy), _get_move(self.move)])
+        self.assertEqual(boxes, ["copy", "move"])
+        self.assertEqual(self.copy.report.routed_in, 1)
+        self.assertEqual(self.move.report.routed_in, 1)
+        return
+
+    def test_move_copy(self):
+        boxes = self._get_boxes([_get_move(self.move), _get_move(self.copy, Copy)])
+        self.assertEqual(boxes, ["move"])
+        self.assertEqual(self.copy.report.routed_in, 0)
+        return
+
+    def test_move_self(self):
+        boxes = self._get_boxes([_get_move(self.item), _get_move(self.move)])
+        self.assertEqual(boxes, ["item"])
+        return
+
+    def test_exit(self):
+        boxes = self._get_boxes([_get_rule("If size > 0 Exit \"\""), _get_move(self.move)])
+        self.assertEqual(boxes, ["item"])
+        return
+
+    def test_delete(self):
+        boxes = self._get_boxes([_get_move(self.copy, Copy), _get_rule("If size > 0 Delete \"\""),
+                                 _get_move(self.move)])
+        self.assertEqual(boxes, ["copy"])
+        return
+
+    def test_size(self):
+        # the size is taken from the whole mail, not the headers
+        boxes = self._get_boxes([_get_rule("If size > 50 LogicalAnd \"\""), _get_move(self.move)])
+        self.assertEqual(boxes, ["move"])
+        return
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import io
+import unittest
+
+from pmlib.utils import escape_from, get_positions, iter_messages
+
+_data = b"first mail\x1asecond\x1a\x1athird one\x1a"
+
+
+class TestIterMessages(unittest.TestCase):
+
+    def _get_messages(self, data: bytes, block_size: int) -> list:
+        messages = list(iter_messages(io.BytesIO(data), block_size))
+        return messages
+
+    def test_blocks(self):
+        expected = [b"first mail", b"second", b"", b"third one"]
+
+        # every block size puts a separator on some block edge
+        for _size in range(1, len(_data) + 2):
+            self.assertEqual(self._get_messages(_data, _size), expected, _size)
+        return
+
+    def test_separator_on_edge(self):
+        self.assertEqual(self._get_messages(b"abc\x1adef\x1a", 4), [b"abc", b"def"])
+        self.assertEqual(self._get_messages(b"abc\x1adef\x1a", 3), [b"abc", b"def"])
+        return
+
+    def test_without_separator(self):
+        # a mail without separator is still being written, it is read with the next run
+        for _size in [1, 4, 64]:
+            self.assertEqual(self._get_messages(b"abc\x1adef", _size), [b"abc"])
+        self.assertEqual(self._get_messages(b"", 4), [])
+        return
+
+    def test_positions(self):
+        starts, ends = get_positions(_data)
+        messages = [_data[_start:_end] for _start, _end in zip(starts, ends)]
+        self.assertEqual(messages, self._get_messages(_data, 4))
+
+        starts, ends = get_positions(_data, start=11)
+        self.assertEqual(_data[starts[0]:ends[0]], b"second")
+        return
+
+
+class TestEscapeFrom(unittest.TestCase):
+
+    def test_escape(self):
+        value = b"From a\nFrom b\n>From c\n>>From d\n"
+        self.assertEqual(escape_from(value), b">From a\n>From b\n>>From c\n>>>From d\n")
+        return
+
+    def test_line_start(self):
+        value = b"Mail From me\n From you\nFrom: header\nFromage\n"
+        self.assertEqual(escape_from(value), value)
+        return